@@ -80,6 +80,52 @@ class EmbeddingProvider(ABC):
         pass
 
 
+class EmbeddingCache(ABC):
+    """Abstract base class for persistent embedding caches"""
+
+    @abstractmethod
+    async def initialize(self):
+        """Initialize the cache backend"""
+        pass
+
+    @abstractmethod
+    async def batch_get(
+        self,
+        hashes: List[str],
+        provider: str,
+        model: str
+    ) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings by content hash.
+
+        Args:
+            hashes: SHA-256 hex digests of chunk contents
+            provider: Embedding provider identifier
+            model: Model identifier within the provider
+
+        Returns:
+            Mapping of content hash to embedding vector for cache hits
+        """
+        pass
+
+    @abstractmethod
+    async def batch_put(
+        self,
+        entries: Dict[str, List[float]],
+        provider: str,
+        model: str
+    ):
+        """
+        Store freshly computed embeddings.
+
+        Args:
+            entries: Mapping of content hash to embedding vector
+            provider: Embedding provider identifier
+            model: Model identifier within the provider
+        """
+        pass
+
+
 class VectorDatabase(ABC):
     """Abstract base class for vector database providers"""
     
@@ -346,6 +392,26 @@ class StateManager(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_keys(
+        self,
+        prefix: str = "",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[str]:
+        """
+        List state keys with optional prefix, paginated.
+
+        Args:
+            prefix: Only return keys starting with this prefix
+            limit: Maximum number of keys (None for all)
+            offset: Number of matching keys to skip
+
+        Returns:
+            List of matching keys
+        """
+        pass
+
 
 class WorkflowOrchestrator(ABC):
     """Abstract base class for workflow orchestration"""
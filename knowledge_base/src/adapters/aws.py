@@ -2,6 +2,7 @@
 AWS service adapters for production environments.
 """
 
+import io
 import json
 import asyncio
 import logging
@@ -14,8 +15,10 @@ import boto3
 from botocore.exceptions import ClientError
 import aiohttp
 
+import numpy as np
+
 from src.abstractions import (
-    EmbeddingProvider, VectorDatabase, StorageProvider, 
+    EmbeddingProvider, EmbeddingCache, VectorDatabase, StorageProvider,
     TaskQueue, StateManager, WorkflowOrchestrator
 )
 from src.core.models import Document, DocumentChunk, KnowledgeChunk, IngestionTask
@@ -88,7 +91,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
                 
         return batch_embeddings
     
-    async def get_embedding_dimension(self) -> int:
+    def get_embedding_dimension(self) -> int:
         """Get the embedding dimension for Titan model."""
         return 1536  # Amazon Titan Text Embeddings dimension
 
@@ -182,7 +185,8 @@ class OpenSearchVectorDatabase(VectorDatabase):
                 "_index": self.index_name,
                 "_id": doc_id,
                 "_source": {
-                    "vector": vector,
+                    # numpy vectors must become lists for the JSON body
+                    "vector": vector.tolist() if hasattr(vector, 'tolist') else vector,
                     "metadata": metadata,
                     "content": metadata.get("content", "")
                 }
@@ -259,8 +263,92 @@ class OpenSearchVectorDatabase(VectorDatabase):
             logger.error(f"Error searching vectors: {e}")
             return []
     
+    async def get_vector_by_filter(
+        self,
+        index_name: str,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[float]]:
+        """Fetch one stored vector matching a metadata filter.
+
+        A filter query with a vector-only _source avoids the k-NN scan
+        and metadata payload a dummy-vector search would incur.
+        """
+        filter_terms = [
+            {"term": {f"metadata.{key}": value}}
+            for key, value in (filter_criteria or {}).items()
+        ]
+        search_body = {
+            "query": {"bool": {"filter": filter_terms}} if filter_terms
+            else {"match_all": {}},
+            "size": 1,
+            "_source": ["vector"]
+        }
+
+        try:
+            response = await asyncio.to_thread(
+                self.client.search,
+                index=self.index_name,
+                body=search_body
+            )
+
+            hits = response['hits']['hits']
+            if not hits:
+                return None
+            return hits[0]['_source'].get('vector')
+
+        except Exception as e:
+            logger.error(f"Error fetching vector by filter: {e}")
+            return None
+
+    async def filter_only(
+        self,
+        index_name: str,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        top_k: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Fetch documents by metadata filter without a k-NN scan.
+
+        A plain bool/term query lets OpenSearch answer from the inverted
+        index instead of scoring every vector against a zero vector.
+        """
+        filter_terms = [
+            {"term": {f"metadata.{key}": value}}
+            for key, value in (filter_criteria or {}).items()
+        ]
+        search_body = {
+            "query": {"bool": {"filter": filter_terms}} if filter_terms
+            else {"match_all": {}},
+            "size": top_k
+        }
+
+        try:
+            response = await asyncio.to_thread(
+                self.client.search,
+                index=self.index_name,
+                body=search_body
+            )
+
+            results = []
+            for hit in response['hits']['hits']:
+                source = hit['_source']
+                metadata = source.get('metadata', {})
+                results.append({
+                    'id': hit['_id'],
+                    'score': 0.0,
+                    'content': source.get('content', ''),
+                    'metadata': metadata
+                })
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in metadata-only search: {e}")
+            return []
+
     async def delete_vectors(self, ids: List[str]):
         """Delete vectors by IDs."""
+        if not ids:
+            return
         try:
             actions = [
                 {
@@ -272,9 +360,10 @@ class OpenSearchVectorDatabase(VectorDatabase):
             ]
             
             from opensearchpy.helpers import bulk
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: bulk(self.client, actions, ignore=404)
+            # Large chunk_size keeps a multi-thousand id delete to as few
+            # bulk requests as possible (helper default is 500 per call)
+            await asyncio.to_thread(
+                bulk, self.client, actions, chunk_size=5000, ignore=404
             )
         except Exception as e:
             logger.error(f"Error deleting vectors: {e}")
@@ -306,22 +395,42 @@ class S3StorageProvider(StorageProvider):
                 lambda: boto3.client('s3', region_name=self.region_name)
             )
     
+    # Payloads at or above this size upload as concurrent multipart
+    # parts instead of one long single-connection PUT
+    MULTIPART_THRESHOLD = 8 * 1024 * 1024
+    MULTIPART_CONCURRENCY = 10
+
     async def store_file(self, file_path: str, content: bytes) -> str:
         """Store file in S3."""
         if self.client is None:
             await self.initialize()
-            
+
         key = f"{self.prefix}/{file_path}".strip('/')
-        
+
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.put_object(
+            if len(content) >= self.MULTIPART_THRESHOLD:
+                # upload_fileobj runs a managed multipart transfer with
+                # parallel part uploads, so large documents saturate the
+                # link instead of riding one TCP connection
+                from boto3.s3.transfer import TransferConfig
+                config = TransferConfig(
+                    multipart_threshold=self.MULTIPART_THRESHOLD,
+                    max_concurrency=self.MULTIPART_CONCURRENCY
+                )
+                await asyncio.to_thread(
+                    self.client.upload_fileobj,
+                    io.BytesIO(content),
+                    self.bucket_name,
+                    key,
+                    Config=config
+                )
+            else:
+                await asyncio.to_thread(
+                    self.client.put_object,
                     Bucket=self.bucket_name,
                     Key=key,
                     Body=content
                 )
-            )
             return f"s3://{self.bucket_name}/{key}"
         except ClientError as e:
             logger.error(f"Error storing file: {e}")
@@ -580,30 +689,144 @@ class DynamoDBStateManager(StateManager):
         except ClientError as e:
             logger.error(f"Error deleting state: {e}")
     
-    async def list_keys(self, prefix: str = "") -> List[str]:
-        """List all keys with optional prefix."""
+    async def list_keys(
+        self,
+        prefix: str = "",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[str]:
+        """List keys with optional prefix, paginated.
+
+        The scan Limit caps items examined per page (it applies before
+        the filter), so pages continue until offset + limit matching
+        keys are collected or the table is exhausted.
+        """
         if self.client is None:
             await self.initialize()
-            
+
         try:
-            # Use scan with filter for prefix matching
+            needed = None if limit is None else offset + limit
+            scan_kwargs: Dict[str, Any] = {}
             if prefix:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.table.scan(
-                        FilterExpression="begins_with(#k, :prefix)",
-                        ExpressionAttributeNames={'#k': 'key'},
-                        ExpressionAttributeValues={':prefix': prefix}
-                    )
+                # Use scan with filter for prefix matching
+                scan_kwargs.update(
+                    FilterExpression="begins_with(#k, :prefix)",
+                    ExpressionAttributeNames={'#k': 'key'},
+                    ExpressionAttributeValues={':prefix': prefix}
                 )
-            else:
+            if needed is not None:
+                scan_kwargs['Limit'] = needed
+
+            keys: List[str] = []
+            while True:
                 response = await asyncio.get_event_loop().run_in_executor(
                     None,
-                    lambda: self.table.scan()
+                    lambda kwargs=dict(scan_kwargs): self.table.scan(**kwargs)
                 )
-            
-            return [item['key'] for item in response.get('Items', [])]
-            
+                keys.extend(item['key'] for item in response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                if last_key is None or (needed is not None and len(keys) >= needed):
+                    break
+                scan_kwargs['ExclusiveStartKey'] = last_key
+
+            return keys[offset:needed]
+
         except ClientError as e:
             logger.error(f"Error listing keys: {e}")
-            return []
\ No newline at end of file
+            return []
+
+class DynamoDBEmbeddingCache(EmbeddingCache):
+    """AWS DynamoDB embedding cache.
+
+    Items are keyed by 'cache_key' = "provider#model#hash" with the
+    embedding stored as a packed float32 binary attribute.
+    """
+
+    # DynamoDB BatchGetItem accepts at most 100 keys per request
+    _BATCH_GET_LIMIT = 100
+
+    def __init__(self, table_name: str, region_name: str = "us-east-1"):
+        self.table_name = table_name
+        self.region_name = region_name
+        self.table = None
+
+    async def initialize(self):
+        """Initialize DynamoDB resource."""
+        if self.table is None:
+            dynamodb = await asyncio.to_thread(
+                boto3.resource, 'dynamodb', region_name=self.region_name
+            )
+            self.table = dynamodb.Table(self.table_name)
+
+    @staticmethod
+    def _cache_key(content_hash: str, provider: str, model: str) -> str:
+        return f"{provider}#{model}#{content_hash}"
+
+    async def batch_get(
+        self,
+        hashes: List[str],
+        provider: str,
+        model: str
+    ) -> Dict[str, List[float]]:
+        """Look up cached embeddings by content hash."""
+        if not hashes:
+            return {}
+        if self.table is None:
+            await self.initialize()
+
+        def _get():
+            found = {}
+            client = self.table.meta.client
+            prefix_len = len(provider) + len(model) + 2
+            try:
+                for start in range(0, len(hashes), self._BATCH_GET_LIMIT):
+                    chunk = hashes[start:start + self._BATCH_GET_LIMIT]
+                    request = {
+                        self.table_name: {
+                            'Keys': [
+                                {'cache_key': self._cache_key(h, provider, model)}
+                                for h in chunk
+                            ]
+                        }
+                    }
+                    # Retry unprocessed keys until DynamoDB drains them
+                    while request:
+                        response = client.batch_get_item(RequestItems=request)
+                        for item in response.get('Responses', {}).get(self.table_name, []):
+                            content_hash = item['cache_key'][prefix_len:]
+                            vector_bytes = bytes(item['vector'])
+                            found[content_hash] = np.frombuffer(
+                                vector_bytes, dtype=np.float32
+                            ).tolist()
+                        request = response.get('UnprocessedKeys') or None
+            except ClientError as e:
+                logger.error(f"Error reading embedding cache: {e}")
+            return found
+
+        return await asyncio.to_thread(_get)
+
+    async def batch_put(
+        self,
+        entries: Dict[str, List[float]],
+        provider: str,
+        model: str
+    ):
+        """Store freshly computed embeddings."""
+        if not entries:
+            return
+        if self.table is None:
+            await self.initialize()
+
+        def _put():
+            try:
+                # batch_writer handles the 25-item write limit and retries
+                with self.table.batch_writer() as writer:
+                    for content_hash, vector in entries.items():
+                        writer.put_item(Item={
+                            'cache_key': self._cache_key(content_hash, provider, model),
+                            'vector': np.asarray(vector, dtype=np.float32).tobytes()
+                        })
+            except ClientError as e:
+                logger.error(f"Error writing embedding cache: {e}")
+
+        await asyncio.to_thread(_put)
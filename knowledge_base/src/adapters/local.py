@@ -3,23 +3,27 @@ Local service adapters for development and POC environments.
 """
 
 import os
-import json
+import aiofiles
 import sqlite3
-import redis
+import redis.asyncio as redis
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import hashlib
 import pickle
+import secrets
+import time
 import logging
 
+import orjson
+
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
 from src.abstractions import (
-    EmbeddingProvider, VectorDatabase, StorageProvider, 
+    EmbeddingProvider, EmbeddingCache, VectorDatabase, StorageProvider,
     TaskQueue, StateManager, WorkflowOrchestrator
 )
 from src.core.models import Document, DocumentChunk, KnowledgeChunk, IngestionTask
@@ -37,10 +41,14 @@ class LocalEmbeddingProvider(EmbeddingProvider):
     async def initialize(self):
         """Initialize the embedding model."""
         if self.model is None:
-            # Load model in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            self.model = await loop.run_in_executor(
-                None, SentenceTransformer, self.model_name
+            # Load model in a worker thread to avoid blocking
+            self.model = await asyncio.to_thread(
+                SentenceTransformer, self.model_name
+            )
+            # Warm-up encode: materializes lazy weights and spins up the
+            # OpenMP thread pool before the first real request
+            await asyncio.to_thread(
+                self.model.encode, ['warmup'], convert_to_numpy=True
             )
         
     async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -48,11 +56,8 @@ class LocalEmbeddingProvider(EmbeddingProvider):
         if self.model is None:
             await self.initialize()
             
-        # Generate embeddings in thread pool
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, self.model.encode, texts
-        )
+        # Generate embeddings in a worker thread
+        embeddings = await asyncio.to_thread(self.model.encode, texts)
         
         return embeddings.tolist()
     
@@ -81,34 +86,114 @@ class LocalEmbeddingProvider(EmbeddingProvider):
 
 class LocalVectorDatabase(VectorDatabase):
     """Local vector database using ChromaDB."""
-    
-    def __init__(self, persist_directory: str = "./chroma_db"):
+
+    # Upsert batch size - keeps peak memory bounded and lets ChromaDB's
+    # HNSW inserts stream instead of serializing one huge payload
+    ADD_BATCH_SIZE = 1000
+
+    # Metadata keys whose list values are stored as comma-joined tags
+    TAG_KEYS = frozenset({'auto_tags', 'manual_tags', 'tags'})
+
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64
+    ):
         self.persist_directory = persist_directory
+        # HNSW hyperparameters - defaults tuned for dense MiniLM-style
+        # embeddings rather than ChromaDB's generic workload defaults
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
         self.client = None
         self.collection = None
-        
+        # Collection handles keyed by name - avoids a thread-pool hop to
+        # get_or_create_collection on every index/search call
+        self._collections: Dict[str, Any] = {}
+
     async def initialize(self, collection_name: str = "knowledge_base"):
         """Initialize ChromaDB."""
         if self.client is None:
-            # Initialize ChromaDB in thread pool
-            loop = asyncio.get_event_loop()
-            self.client = await loop.run_in_executor(
-                None, 
-                lambda: chromadb.PersistentClient(
-                    path=self.persist_directory,
-                    settings=Settings(anonymized_telemetry=False)
-                )
+            # Initialize ChromaDB in a worker thread
+            self.client = await asyncio.to_thread(
+                chromadb.PersistentClient,
+                path=self.persist_directory,
+                settings=Settings(anonymized_telemetry=False)
             )
-            
-        # Get or create collection
-        loop = asyncio.get_event_loop()  # Re-acquire loop reference
-        self.collection = await loop.run_in_executor(
-            None,
-            lambda: self.client.get_or_create_collection(
+
+        # Reuse the cached collection handle when we already have it
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = await asyncio.to_thread(
+                self.client.get_or_create_collection,
                 name=collection_name,
-                metadata={"hnsw:space": "cosine"}
+                metadata={
+                    "hnsw:space": "cosine",
+                    "hnsw:M": self.hnsw_m,
+                    "hnsw:construction_ef": self.hnsw_ef_construction,
+                    "hnsw:search_ef": self.hnsw_ef_search
+                }
+            )
+            self._collections[collection_name] = collection
+
+        self.collection = collection
+
+    async def tune_index(
+        self,
+        query_vectors: List[List[float]],
+        expected_ids: List[List[str]],
+        candidate_ef_values: Optional[List[int]] = None,
+        top_k: int = 10,
+        target_recall: float = 0.95
+    ) -> int:
+        """
+        Tune efSearch against a held-out query set.
+
+        Runs a monotonic search over candidate efSearch values and keeps
+        the smallest one that reaches the target recall (recall only
+        increases with efSearch, so we can stop at the first hit).
+
+        Args:
+            query_vectors: Held-out query embeddings
+            expected_ids: Ground-truth result IDs per query
+            candidate_ef_values: efSearch values to try (ascending)
+            top_k: Results to retrieve per query
+            target_recall: Recall threshold to stop at
+
+        Returns:
+            The selected efSearch value (also written back to the collection)
+        """
+        if candidate_ef_values is None:
+            candidate_ef_values = [16, 32, 50, 64, 100, 128, 200]
+
+        best_ef = candidate_ef_values[-1]
+        for ef in candidate_ef_values:
+            # Apply the candidate value before measuring recall
+            await asyncio.to_thread(
+                self.collection.modify, metadata={"hnsw:search_ef": ef}
             )
+
+            total_recall = 0.0
+            for query_vector, expected in zip(query_vectors, expected_ids):
+                results = await self.search_vectors(query_vector, limit=top_k)
+                retrieved = {doc_id for doc_id, _, _ in results}
+                if expected:
+                    total_recall += len(retrieved & set(expected)) / len(expected)
+
+            recall = total_recall / len(query_vectors) if query_vectors else 0.0
+            if recall >= target_recall:
+                best_ef = ef
+                break
+
+        # Write the selected value back for subsequent searches
+        self.hnsw_ef_search = best_ef
+        await asyncio.to_thread(
+            self.collection.modify, metadata={"hnsw:search_ef": best_ef}
         )
+
+        return best_ef
     
     async def add_vectors(
         self, 
@@ -117,14 +202,11 @@ class LocalVectorDatabase(VectorDatabase):
         ids: List[str]
     ):
         """Add vectors to the database."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: self.collection.add(
-                embeddings=vectors,
-                metadatas=metadatas,
-                ids=ids
-            )
+        await asyncio.to_thread(
+            self.collection.add,
+            embeddings=vectors,
+            metadatas=metadatas,
+            ids=ids
         )
     
     async def search_vectors(
@@ -134,18 +216,14 @@ class LocalVectorDatabase(VectorDatabase):
         filter_dict: Optional[Dict[str, Any]] = None
     ) -> List[Tuple[str, float, Dict[str, Any]]]:
         """Search for similar vectors."""
-        loop = asyncio.get_event_loop()
-        
         # Prepare where clause for filtering
         where_clause = filter_dict if filter_dict else None
         
-        results = await loop.run_in_executor(
-            None,
-            lambda: self.collection.query(
-                query_embeddings=[query_vector],
-                n_results=limit,
-                where=where_clause
-            )
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=[query_vector],
+            n_results=limit,
+            where=where_clause
         )
         
         # Format results
@@ -160,11 +238,7 @@ class LocalVectorDatabase(VectorDatabase):
     
     async def delete_vectors(self, ids: List[str]):
         """Delete vectors by IDs."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: self.collection.delete(ids=ids)
-        )
+        await asyncio.to_thread(self.collection.delete, ids=ids)
     
     async def update_vectors(
         self, 
@@ -173,14 +247,11 @@ class LocalVectorDatabase(VectorDatabase):
         metadatas: List[Dict[str, Any]]
     ):
         """Update existing vectors."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: self.collection.update(
-                ids=ids,
-                embeddings=vectors,
-                metadatas=metadatas
-            )
+        await asyncio.to_thread(
+            self.collection.update,
+            ids=ids,
+            embeddings=vectors,
+            metadatas=metadatas
         )
     
     async def create_index(self, index_name: str, dimension: int, **kwargs) -> bool:
@@ -202,32 +273,41 @@ class LocalVectorDatabase(VectorDatabase):
             # Ensure we're working with the correct collection
             await self.initialize(collection_name=index_name)
             
-            # Extract data from documents
-            ids = [doc['id'] for doc in documents]
-            vectors = [doc['vector'] for doc in documents]
-            metadatas = []
-            
-            for doc in documents:
-                metadata = doc.get('metadata', {}).copy()
-                metadata['content'] = doc.get('content', '')
-                
-                # Convert list fields to strings for ChromaDB compatibility
-                for key, value in metadata.items():
-                    if isinstance(value, list):
-                        if key in ['auto_tags', 'manual_tags', 'tags']:
-                            # Join tags with commas
-                            metadata[key] = ','.join(str(tag) for tag in value) if value else ''
+            # Process documents in fixed-size batches so peak memory stays
+            # bounded regardless of how many documents are indexed at once
+            batch_size = self.ADD_BATCH_SIZE
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+
+                # Extract data from documents
+                ids = [doc['id'] for doc in batch]
+                vectors = [doc['vector'] for doc in batch]
+                metadatas = []
+
+                tag_keys = self.TAG_KEYS
+                for doc in batch:
+                    metadata = {'content': doc.get('content', '')}
+
+                    # Normalize list/dict fields to strings for ChromaDB
+                    # compatibility; builds a fresh dict rather than
+                    # mutating the source while iterating it
+                    for key, value in doc.get('metadata', {}).items():
+                        value_type = type(value)
+                        if value_type is list:
+                            if key in tag_keys:
+                                metadata[key] = ','.join(map(str, value)) if value else ''
+                            else:
+                                metadata[key] = orjson.dumps(value).decode()
+                        elif value_type is dict:
+                            metadata[key] = orjson.dumps(value).decode()
                         else:
-                            # Convert other lists to JSON strings
-                            metadata[key] = str(value)
-                    elif isinstance(value, dict):
-                        # Convert dict to JSON string
-                        import json
-                        metadata[key] = json.dumps(value)
-                
-                metadatas.append(metadata)
-            
-            await self.add_vectors(vectors, metadatas, ids)
+                            metadata[key] = value
+
+                    metadatas.append(metadata)
+
+                # Serialize batches - they target the same collection
+                await self.add_vectors(vectors, metadatas, ids)
+
             return True
             
         except Exception as e:
@@ -269,17 +349,87 @@ class LocalVectorDatabase(VectorDatabase):
             logger.error(f"Failed to search in {index_name}: {e}")
             return []
     
+    async def get_vector_by_filter(
+        self,
+        index_name: str,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[float]]:
+        """Fetch one stored embedding matching a metadata filter.
+
+        Used to seed related-document searches without running a
+        dummy-vector similarity query first.
+        """
+        try:
+            await self.initialize(collection_name=index_name)
+
+            results = await asyncio.to_thread(
+                self.collection.get,
+                where=filter_criteria if filter_criteria else None,
+                limit=1,
+                include=['embeddings']
+            )
+
+            embeddings = results.get('embeddings')
+            if embeddings is None or len(embeddings) == 0:
+                return None
+
+            embedding = embeddings[0]
+            return embedding.tolist() if hasattr(embedding, 'tolist') else embedding
+
+        except Exception as e:
+            logger.error(f"Failed vector lookup in {index_name}: {e}")
+            return None
+
+    async def filter_only(
+        self,
+        index_name: str,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        top_k: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Fetch documents by metadata filter without a similarity scan.
+
+        ChromaDB's get() walks the metadata index directly, so this
+        skips the HNSW traversal a zero-vector query would still run.
+        """
+        try:
+            await self.initialize(collection_name=index_name)
+
+            results = await asyncio.to_thread(
+                self.collection.get,
+                where=filter_criteria if filter_criteria else None,
+                limit=top_k,
+                include=['metadatas']
+            )
+
+            formatted_results = []
+            metadatas = results.get('metadatas') or []
+            for doc_id, metadata in zip(results.get('ids', []), metadatas):
+                metadata = metadata or {}
+                formatted_results.append({
+                    'id': doc_id,
+                    'score': 0.0,
+                    'content': metadata.get('content', ''),
+                    'metadata': {k: v for k, v in metadata.items() if k != 'content'}
+                })
+
+            return formatted_results
+
+        except Exception as e:
+            logger.error(f"Failed metadata-only search in {index_name}: {e}")
+            return []
+
     async def delete_index(self, index_name: str) -> bool:
         """Delete an index (collection in ChromaDB)."""
         try:
             if self.client is None:
                 await self.initialize()
                 
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.client.delete_collection(name=index_name)
-            )
+            await asyncio.to_thread(self.client.delete_collection, name=index_name)
+            
+            # Drop the stale handle so a recreate refetches it
+            stale = self._collections.pop(index_name, None)
+            if self.collection is stale:
+                self.collection = None
             return True
             
         except Exception as e:
@@ -289,23 +439,45 @@ class LocalVectorDatabase(VectorDatabase):
 
 class LocalStorageProvider(StorageProvider):
     """Local file storage provider."""
-    
+
+    # Write chunk size for large payloads
+    WRITE_CHUNK_SIZE = 1 << 20
+
     def __init__(self, base_path: str = "./storage"):
         self.base_path = base_path
         os.makedirs(base_path, exist_ok=True)
-        
-    async def store_file(self, file_path: str, content: bytes) -> str:
-        """Store file locally."""
+
+    def _resolve_path(self, file_path: str) -> str:
+        """Resolve a storage path and ensure its directory exists."""
         full_path = os.path.join(self.base_path, file_path.lstrip('/'))
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        
-        # Write file in thread pool
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: open(full_path, 'wb').write(content)
-        )
-        
+        return full_path
+
+    async def store_file(self, file_path: str, content: bytes) -> str:
+        """Store file locally."""
+        full_path = self._resolve_path(file_path)
+
+        # Write in fixed-size slices; memoryview avoids copying the
+        # payload again for each slice
+        view = memoryview(content)
+        async with aiofiles.open(full_path, 'wb') as f:
+            for start in range(0, len(content), self.WRITE_CHUNK_SIZE):
+                await f.write(view[start:start + self.WRITE_CHUNK_SIZE])
+
+        return full_path
+
+    async def store_file_stream(
+        self,
+        file_path: str,
+        source: AsyncIterator[bytes]
+    ) -> str:
+        """Store file from an async byte stream without buffering it all."""
+        full_path = self._resolve_path(file_path)
+
+        async with aiofiles.open(full_path, 'wb') as f:
+            async for chunk in source:
+                await f.write(chunk)
+
         return full_path
     
     async def retrieve_file(self, file_path: str) -> bytes:
@@ -315,12 +487,12 @@ class LocalStorageProvider(StorageProvider):
         if not os.path.exists(full_path):
             raise FileNotFoundError(f"File not found: {file_path}")
             
-        # Read file in thread pool
-        loop = asyncio.get_event_loop()
-        content = await loop.run_in_executor(
-            None,
-            lambda: open(full_path, 'rb').read()
-        )
+        # Read file without an executor hop
+        async with aiofiles.open(full_path, 'rb') as f:
+            # Hint the kernel that this is a sequential read
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            content = await f.read()
         
         return content
     
@@ -329,25 +501,24 @@ class LocalStorageProvider(StorageProvider):
         full_path = os.path.join(self.base_path, file_path.lstrip('/'))
         
         if os.path.exists(full_path):
-            await asyncio.get_event_loop().run_in_executor(
-                None, os.remove, full_path
-            )
+            await asyncio.to_thread(os.remove, full_path)
     
     async def list_files(self, prefix: str = "") -> List[str]:
         """List files with optional prefix."""
         full_prefix = os.path.join(self.base_path, prefix.lstrip('/'))
         files = []
         
-        def _walk_files():
-            for root, dirs, filenames in os.walk(full_prefix):
-                for filename in filenames:
-                    rel_path = os.path.relpath(
-                        os.path.join(root, filename), 
-                        self.base_path
-                    )
-                    files.append(rel_path)
+        def _scan_files(directory: str):
+            # os.scandir avoids the extra stat calls os.walk incurs
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        _scan_files(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append(os.path.relpath(entry.path, self.base_path))
         
-        await asyncio.get_event_loop().run_in_executor(None, _walk_files)
+        if os.path.isdir(full_prefix):
+            await asyncio.to_thread(_scan_files, full_prefix)
         return files
 
 
@@ -361,9 +532,11 @@ class LocalTaskQueue(TaskQueue):
     async def initialize(self):
         """Initialize Redis connection."""
         if self.redis_client is None:
-            self.redis_client = redis.from_url(
+            # Raw bytes end-to-end; values are decoded exactly once at
+            # the point of use instead of for every returned field
+            self.redis_client = redis.Redis.from_url(
                 self.redis_url, 
-                decode_responses=True
+                decode_responses=False
             )
     
     async def enqueue_task(self, queue_name: str, task_data: Dict[str, Any]) -> str:
@@ -371,25 +544,22 @@ class LocalTaskQueue(TaskQueue):
         if self.redis_client is None:
             await self.initialize()
             
-        task_id = hashlib.md5(
-            f"{queue_name}_{datetime.now().isoformat()}_{json.dumps(task_data)}".encode()
-        ).hexdigest()
+        # Time-prefixed random id: unique, roughly sortable, and avoids
+        # JSON-encoding + hashing the whole payload just to mint an id
+        task_id = f"{time.time_ns():016x}{secrets.token_hex(8)}"
         
         task_payload = {
             "id": task_id,
-            "data": task_data,
+            "data": orjson.dumps(task_data),
             "created_at": datetime.now().isoformat(),
             "status": "pending"
         }
         
-        # Add to queue and store task data
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: [
-                self.redis_client.lpush(queue_name, task_id),
-                self.redis_client.hset(f"task:{task_id}", mapping=task_payload)
-            ]
-        )
+        # Pipeline both commands into a single round-trip
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.lpush(queue_name, task_id)
+        pipe.hset(f"task:{task_id}", mapping=task_payload)
+        await pipe.execute()
         
         return task_id
     
@@ -399,20 +569,19 @@ class LocalTaskQueue(TaskQueue):
             await self.initialize()
             
         # Blocking pop with timeout
-        result = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.redis_client.brpop(queue_name, timeout=timeout)
-        )
+        result = await self.redis_client.brpop(queue_name, timeout=timeout)
         
         if result:
             queue, task_id = result
-            task_data = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.redis_client.hgetall(f"task:{task_id}")
-            )
+            task_id = task_id.decode()
+            raw = await self.redis_client.hgetall(f"task:{task_id}")
             
-            if task_data:
-                task_data['data'] = json.loads(task_data['data'])
+            if raw:
+                task_data = {
+                    key.decode(): (value if key == b'data' else value.decode())
+                    for key, value in raw.items()
+                }
+                task_data['data'] = orjson.loads(task_data['data'])
                 return task_data
                 
         return None
@@ -422,12 +591,9 @@ class LocalTaskQueue(TaskQueue):
         if self.redis_client is None:
             await self.initialize()
             
-        status = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.redis_client.hget(f"task:{task_id}", "status")
-        )
+        status = await self.redis_client.hget(f"task:{task_id}", "status")
         
-        return status
+        return status.decode() if status is not None else None
     
     async def update_task_status(self, task_id: str, status: str, result: Optional[Dict[str, Any]] = None):
         """Update task status."""
@@ -440,16 +606,24 @@ class LocalTaskQueue(TaskQueue):
         }
         
         if result:
-            updates["result"] = json.dumps(result)
+            updates["result"] = orjson.dumps(result)
             
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.redis_client.hset(f"task:{task_id}", mapping=updates)
-        )
+        await self.redis_client.hset(f"task:{task_id}", mapping=updates)
 
 
 class LocalStateManager(StateManager):
     """Local state manager using SQLite."""
+
+    # Cached statements - sqlite3 reuses the prepared statement when the
+    # same SQL string object is executed on a connection
+    _SET_STATE_SQL = """INSERT OR REPLACE INTO state_data (key, value, updated_at) 
+                   VALUES (?, ?, CURRENT_TIMESTAMP)"""
+    _GET_STATE_SQL = "SELECT value FROM state_data WHERE key = ?"
+
+    _TASK_COLUMNS = (
+        'task_id', 'task_type', 'status', 'source_location', 'source_type',
+        'metadata', 'error_message', 'result_data', 'created_at', 'updated_at'
+    )
     
     def __init__(self, db_path: str = "./state.db"):
         self.db_path = db_path
@@ -458,22 +632,31 @@ class LocalStateManager(StateManager):
     async def initialize(self):
         """Initialize SQLite database."""
         if self.conn is None:
-            self.conn = await asyncio.get_event_loop().run_in_executor(
-                None, sqlite3.connect, self.db_path
+            # isolation_level=None autocommits, so writes no longer pay
+            # an explicit commit per call
+            self.conn = await asyncio.to_thread(
+                sqlite3.connect, self.db_path,
+                check_same_thread=False, isolation_level=None
             )
             
             # Create tables
-            await asyncio.get_event_loop().run_in_executor(
-                None, self._create_tables
-            )
+            await asyncio.to_thread(self._create_tables)
     
     def _create_tables(self):
-        """Create necessary tables."""
+        """Create necessary tables and tune the connection."""
         cursor = self.conn.cursor()
+        
+        # WAL + relaxed sync gives far better small-write throughput than
+        # the default rollback journal with a full fsync per commit
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS state_data (
                 key TEXT PRIMARY KEY,
-                value TEXT,
+                value BLOB,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -493,8 +676,18 @@ class LocalStateManager(StateManager):
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        self.conn.commit()
-    
+
+        # Indexes for list_tasks - turn the status filter + recency sort
+        # into an index range scan instead of a full scan + sort
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_task_status_created
+            ON task_records(status, created_at DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_task_created
+            ON task_records(created_at DESC)
+        """)
+
     async def get_state(self, key: str) -> Optional[Any]:
         """Get state value."""
         if self.conn is None:
@@ -502,11 +695,17 @@ class LocalStateManager(StateManager):
             
         def _get():
             cursor = self.conn.cursor()
-            cursor.execute("SELECT value FROM state_data WHERE key = ?", (key,))
+            cursor.execute(self._GET_STATE_SQL, (key,))
             result = cursor.fetchone()
-            return pickle.loads(result[0]) if result else None
+            if result is None:
+                return None
+            try:
+                return orjson.loads(result[0])
+            except orjson.JSONDecodeError:
+                # Rows written before the orjson switch are pickled
+                return pickle.loads(result[0])
             
-        return await asyncio.get_event_loop().run_in_executor(None, _get)
+        return await asyncio.to_thread(_get)
     
     async def set_state(self, key: str, value: Any):
         """Set state value."""
@@ -515,15 +714,16 @@ class LocalStateManager(StateManager):
             
         def _set():
             cursor = self.conn.cursor()
-            pickled_value = pickle.dumps(value)
-            cursor.execute(
-                """INSERT OR REPLACE INTO state_data (key, value, updated_at) 
-                   VALUES (?, ?, CURRENT_TIMESTAMP)""",
-                (key, pickled_value)
-            )
-            self.conn.commit()
+            try:
+                serialized_value = orjson.dumps(
+                    value, option=orjson.OPT_SERIALIZE_NUMPY
+                )
+            except TypeError:
+                # Non-JSON-serializable state falls back to pickle
+                serialized_value = pickle.dumps(value)
+            cursor.execute(self._SET_STATE_SQL, (key, serialized_value))
             
-        await asyncio.get_event_loop().run_in_executor(None, _set)
+        await asyncio.to_thread(_set)
     
     async def delete_state(self, key: str):
         """Delete state value."""
@@ -533,24 +733,36 @@ class LocalStateManager(StateManager):
         def _delete():
             cursor = self.conn.cursor()
             cursor.execute("DELETE FROM state_data WHERE key = ?", (key,))
-            self.conn.commit()
             
-        await asyncio.get_event_loop().run_in_executor(None, _delete)
+        await asyncio.to_thread(_delete)
     
-    async def list_keys(self, prefix: str = "") -> List[str]:
+    async def list_keys(
+        self,
+        prefix: str = "",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[str]:
         """List all keys with optional prefix."""
         if self.conn is None:
             await self.initialize()
             
         def _list():
             cursor = self.conn.cursor()
+            # Negative LIMIT means unlimited in SQLite
+            effective_limit = -1 if limit is None else limit
             if prefix:
-                cursor.execute("SELECT key FROM state_data WHERE key LIKE ?", (f"{prefix}%",))
+                cursor.execute(
+                    "SELECT key FROM state_data WHERE key LIKE ? LIMIT ? OFFSET ?",
+                    (f"{prefix}%", effective_limit, offset)
+                )
             else:
-                cursor.execute("SELECT key FROM state_data")
+                cursor.execute(
+                    "SELECT key FROM state_data LIMIT ? OFFSET ?",
+                    (effective_limit, offset)
+                )
             return [row[0] for row in cursor.fetchall()]
             
-        return await asyncio.get_event_loop().run_in_executor(None, _list)
+        return await asyncio.to_thread(_list)
     
     async def create_task_record(
         self,
@@ -577,16 +789,15 @@ class LocalStateManager(StateManager):
                         "QUEUED",  # Initial status
                         source_location,
                         source_type.value if hasattr(source_type, 'value') else str(source_type),
-                        json.dumps(metadata) if metadata else None
+                        orjson.dumps(metadata) if metadata else None
                     )
                 )
-                self.conn.commit()
                 return True
             except Exception as e:
                 logger.error(f"Failed to create task record {task_id}: {e}")
                 return False
                 
-        return await asyncio.get_event_loop().run_in_executor(None, _create)
+        return await asyncio.to_thread(_create)
     
     async def update_task_status(
         self,
@@ -609,17 +820,16 @@ class LocalStateManager(StateManager):
                     (
                         status.value if hasattr(status, 'value') else str(status),
                         error_message,
-                        json.dumps(result_data) if result_data else None,
+                        orjson.dumps(result_data) if result_data else None,
                         task_id
                     )
                 )
-                self.conn.commit()
                 return cursor.rowcount > 0
             except Exception as e:
                 logger.error(f"Failed to update task status {task_id}: {e}")
                 return False
                 
-        return await asyncio.get_event_loop().run_in_executor(None, _update)
+        return await asyncio.to_thread(_update)
     
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get current task status and details."""
@@ -644,9 +854,9 @@ class LocalStateManager(StateManager):
                         'status': row[2],
                         'source_location': row[3],
                         'source_type': row[4],
-                        'metadata': json.loads(row[5]) if row[5] else {},
+                        'metadata': orjson.loads(row[5]) if row[5] else {},
                         'error_message': row[6],
-                        'result_data': json.loads(row[7]) if row[7] else None,
+                        'result_data': orjson.loads(row[7]) if row[7] else None,
                         'created_at': row[8],
                         'updated_at': row[9]
                     }
@@ -655,61 +865,197 @@ class LocalStateManager(StateManager):
                 logger.error(f"Failed to get task status {task_id}: {e}")
                 return None
                 
-        return await asyncio.get_event_loop().run_in_executor(None, _get)
+        return await asyncio.to_thread(_get)
     
     async def list_tasks(
         self,
         status_filter=None,  # Optional TaskStatus enum
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        created_before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """List tasks with optional filtering."""
+        """List tasks with optional filtering.
+
+        Pass the `created_at` of the last row from the previous page as
+        `created_before` for keyset pagination; unlike OFFSET it stays
+        O(log N) regardless of page depth.
+        """
         if self.conn is None:
             await self.initialize()
-            
+
         def _list():
             try:
                 cursor = self.conn.cursor()
-                
+
+                conditions = []
+                params = []
+
                 if status_filter:
                     status_value = status_filter.value if hasattr(status_filter, 'value') else str(status_filter)
+                    conditions.append("status = ?")
+                    params.append(status_value)
+
+                if created_before:
+                    conditions.append("created_at < ?")
+                    params.append(created_before)
+
+                where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+                if created_before:
+                    # Keyset pagination - the cursor already positions us
                     cursor.execute(
-                        """SELECT task_id, task_type, status, source_location, source_type, 
-                                  metadata, error_message, result_data, created_at, updated_at
-                           FROM task_records WHERE status = ?
-                           ORDER BY created_at DESC LIMIT ? OFFSET ?""",
-                        (status_value, limit, offset)
+                        f"""SELECT task_id, task_type, status, source_location, source_type,
+                                   metadata, error_message, result_data, created_at, updated_at
+                            FROM task_records {where_sql}
+                            ORDER BY created_at DESC LIMIT ?""",
+                        (*params, limit)
                     )
                 else:
                     cursor.execute(
-                        """SELECT task_id, task_type, status, source_location, source_type, 
-                                  metadata, error_message, result_data, created_at, updated_at
-                           FROM task_records
-                           ORDER BY created_at DESC LIMIT ? OFFSET ?""",
-                        (limit, offset)
+                        f"""SELECT task_id, task_type, status, source_location, source_type,
+                                   metadata, error_message, result_data, created_at, updated_at
+                            FROM task_records {where_sql}
+                            ORDER BY created_at DESC LIMIT ? OFFSET ?""",
+                        (*params, limit, offset)
                     )
                 
                 rows = cursor.fetchall()
-                tasks = []
-                
-                for row in rows:
-                    tasks.append({
-                        'task_id': row[0],
-                        'task_type': row[1],
-                        'status': row[2],
-                        'source_location': row[3],
-                        'source_type': row[4],
-                        'metadata': json.loads(row[5]) if row[5] else {},
-                        'error_message': row[6],
-                        'result_data': json.loads(row[7]) if row[7] else None,
-                        'created_at': row[8],
-                        'updated_at': row[9]
-                    })
-                
+
+                # Bulk-convert rows, then patch the two JSON columns
+                tasks = [dict(zip(self._TASK_COLUMNS, row)) for row in rows]
+                for task in tasks:
+                    task['metadata'] = orjson.loads(task['metadata']) if task['metadata'] else {}
+                    task['result_data'] = orjson.loads(task['result_data']) if task['result_data'] else None
+
                 return tasks
                 
             except Exception as e:
                 logger.error(f"Failed to list tasks: {e}")
                 return []
                 
-        return await asyncio.get_event_loop().run_in_executor(None, _list)
\ No newline at end of file
+        return await asyncio.to_thread(_list)
+
+
+class SQLiteEmbeddingCache(EmbeddingCache):
+    """Persistent embedding cache using SQLite."""
+
+    # Keep IN(...) lists well under SQLite's default 999-variable limit
+    _GET_CHUNK = 400
+
+    def __init__(self, db_path: str = "./embedding_cache.db"):
+        self.db_path = db_path
+        self.conn = None
+
+    async def initialize(self):
+        """Initialize SQLite database."""
+        if self.conn is None:
+            self.conn = await asyncio.to_thread(
+                sqlite3.connect, self.db_path,
+                check_same_thread=False, isolation_level=None
+            )
+            await asyncio.to_thread(
+                self.conn.execute,
+                """CREATE TABLE IF NOT EXISTS embedding_cache (
+                    hash TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (hash, provider, model)
+                )"""
+            )
+
+    async def batch_get(
+        self,
+        hashes: List[str],
+        provider: str,
+        model: str
+    ) -> Dict[str, List[float]]:
+        """Look up cached embeddings by content hash."""
+        if not hashes:
+            return {}
+        if self.conn is None:
+            await self.initialize()
+
+        def _get():
+            found = {}
+            for start in range(0, len(hashes), self._GET_CHUNK):
+                chunk = hashes[start:start + self._GET_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT hash, vector FROM embedding_cache "
+                    f"WHERE provider = ? AND model = ? AND hash IN ({placeholders})",
+                    [provider, model, *chunk]
+                ).fetchall()
+                for content_hash, blob in rows:
+                    # Vectors are stored as packed float32
+                    found[content_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+            return found
+
+        return await asyncio.to_thread(_get)
+
+    async def batch_put(
+        self,
+        entries: Dict[str, List[float]],
+        provider: str,
+        model: str
+    ):
+        """Store freshly computed embeddings."""
+        if not entries:
+            return
+        if self.conn is None:
+            await self.initialize()
+
+        rows = [
+            (content_hash, provider, model,
+             np.asarray(vector, dtype=np.float32).tobytes())
+            for content_hash, vector in entries.items()
+        ]
+        await asyncio.to_thread(
+            self.conn.executemany,
+            "INSERT OR REPLACE INTO embedding_cache (hash, provider, model, vector) "
+            "VALUES (?, ?, ?, ?)",
+            rows
+        )
+
+
+async def warm_local_stack(config) -> Dict[str, Any]:
+    """
+    Instantiate and warm the local adapters concurrently at bootstrap.
+
+    Lazily initializing each adapter on first use makes the first request
+    pay the combined cold-start cost (model load + ChromaDB open + Redis
+    connect + SQLite open). Calling this at app startup overlaps them.
+
+    Args:
+        config: AppConfig with embedding/vector_database/task_queue/
+            state_manager sections
+
+    Returns:
+        Dictionary with the initialized adapters
+    """
+    embedding_provider = LocalEmbeddingProvider(
+        model_name=getattr(config.embedding, 'model_name', None) or "all-MiniLM-L6-v2"
+    )
+    vector_database = LocalVectorDatabase(
+        persist_directory=getattr(config.vector_database, 'persist_directory', None) or "./chroma_db"
+    )
+    task_queue = LocalTaskQueue(
+        redis_url=getattr(config.task_queue, 'redis_url', None) or "redis://localhost:6379/0"
+    )
+    state_manager = LocalStateManager(
+        db_path=getattr(config.state_manager, 'db_path', None) or "./state.db"
+    )
+
+    await asyncio.gather(
+        embedding_provider.initialize(),
+        vector_database.initialize(),
+        task_queue.initialize(),
+        state_manager.initialize()
+    )
+
+    return {
+        'embedding_provider': embedding_provider,
+        'vector_database': vector_database,
+        'task_queue': task_queue,
+        'state_manager': state_manager
+    }
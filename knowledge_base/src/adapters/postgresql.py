@@ -3,24 +3,200 @@ PostgreSQL adapter for state management.
 """
 
 import asyncio
-import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import asyncpg
+import orjson
 from urllib.parse import urlparse
 
+from typing import Callable, Tuple
+
 from src.abstractions import StateManager, TaskStatus, SourceType
 
 logger = logging.getLogger(__name__)
 
 
+# Hot-path SQL as module-level constants - identical string objects give
+# identical statement-cache keys, so every call reuses the prepared plan
+SQL_INSERT_TASK = """
+    INSERT INTO tasks (id, task_type, status, source_location, source_type, metadata)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+SQL_UPDATE_TASK = """
+    UPDATE tasks 
+    SET status = $1, error_message = $2, result_data = $3, updated_at = NOW()
+    WHERE id = $4
+"""
+
+SQL_UPDATE_TASK_RETURNING = """
+    UPDATE tasks 
+    SET status = $1, error_message = $2, result_data = $3, updated_at = NOW()
+    WHERE id = $4
+    RETURNING id, task_type, status, source_location, source_type, 
+              metadata, error_message, result_data, created_at, updated_at
+"""
+
+SQL_GET_TASK = """
+    SELECT id, task_type, status, source_location, source_type, 
+           metadata, error_message, result_data, created_at, updated_at
+    FROM tasks WHERE id = $1
+"""
+
+SQL_LIST_TASKS = """
+    SELECT id, task_type, status, source_location, source_type,
+           metadata, error_message, result_data, created_at, updated_at
+    FROM tasks
+    ORDER BY created_at DESC
+    LIMIT $1 OFFSET $2
+"""
+
+SQL_LIST_TASKS_FILTERED = """
+    SELECT id, task_type, status, source_location, source_type,
+           metadata, error_message, result_data, created_at, updated_at
+    FROM tasks WHERE status = $1
+    ORDER BY created_at DESC
+    LIMIT $2 OFFSET $3
+"""
+
+SQL_UPSERT_DOC = """
+    INSERT INTO documents (id, title, source_location, source_type, metadata, chunk_ids, file_paths)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    ON CONFLICT (id) DO UPDATE SET
+        title = EXCLUDED.title,
+        metadata = EXCLUDED.metadata,
+        chunk_ids = EXCLUDED.chunk_ids,
+        file_paths = EXCLUDED.file_paths,
+        updated_at = NOW()
+"""
+
+SQL_GET_DOC = """
+    SELECT id, title, source_location, source_type, metadata, 
+           status, chunk_ids, file_paths, created_at, updated_at
+    FROM documents WHERE id = $1
+"""
+
+SQL_LIST_DOCS = """
+    SELECT id, title, source_location, source_type, metadata,
+           status, chunk_ids, file_paths, created_at, updated_at,
+           COUNT(*) OVER() AS total_count
+    FROM documents
+    WHERE ($3::text IS NULL OR source_type = $3)
+      AND ($4::jsonb IS NULL OR metadata @> $4)
+    ORDER BY created_at DESC
+    LIMIT $1 OFFSET $2
+"""
+
+
+class _BatchWriter:
+    """
+    Coalesces single-row writes into executemany batches.
+
+    Callers submit argument tuples and await a per-row future; a
+    background drainer collects up to MAX_BATCH rows (or whatever
+    arrives within MAX_WAIT) and flushes them through one acquired
+    connection, collapsing N round-trips into one.
+    """
+
+    MAX_BATCH = 128
+    MAX_WAIT = 0.005  # seconds
+
+    def __init__(self, pool, sql: str, key: Optional[Callable[[Tuple], Any]] = None):
+        self.pool = pool
+        self.sql = sql
+        # Optional dedup key - when set, only the last row per key in a
+        # batch is written (last-writer-wins for status updates/upserts)
+        self.key = key
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._drainer: Optional[asyncio.Task] = None
+
+    async def submit(self, args: Tuple) -> bool:
+        """Queue one row and wait for its batch to flush."""
+        if self._drainer is None:
+            self._drainer = asyncio.create_task(self._drain())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((args, future))
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.MAX_WAIT
+
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            if self.key is not None:
+                # Last write per key wins within the batch
+                deduped = {self.key(args): args for args, _ in batch}
+                rows = list(deduped.values())
+            else:
+                rows = [args for args, _ in batch]
+
+            try:
+                async with self.pool.acquire() as conn:
+                    await conn.executemany(self.sql, rows)
+                result = True
+            except Exception as e:
+                logger.error(f"Batch write failed ({len(rows)} rows): {e}")
+                result = False
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self):
+        """Stop the drainer task."""
+        if self._drainer is not None:
+            self._drainer.cancel()
+            try:
+                await self._drainer
+            except asyncio.CancelledError:
+                pass
+            self._drainer = None
+
+
 class PostgreSQLStateManager(StateManager):
     """PostgreSQL state manager for task state management."""
+
+    # Read-cache tuning: short TTL absorbs polling storms on in-flight
+    # tasks; terminal task states are immutable so they cache longer
+    CACHE_TTL = 0.5
+    TERMINAL_CACHE_TTL = 60.0
+    CACHE_MAX_ENTRIES = 10_000
+    _TERMINAL_STATUSES = frozenset({'SUCCESS', 'FAILED'})
     
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        pool_min_size: int = 10,
+        pool_max_size: int = 50
+    ):
         self.database_url = database_url
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
         self.pool = None
+        self._task_insert_writer: Optional[_BatchWriter] = None
+        self._task_update_writer: Optional[_BatchWriter] = None
+        self._doc_upsert_writer: Optional[_BatchWriter] = None
+        self._task_cache: OrderedDict = OrderedDict()
+        self._doc_cache: OrderedDict = OrderedDict()
+        # Single-flight: concurrent status reads for the same task share
+        # one in-flight query instead of hitting the DB independently
+        self._inflight_tasks: Dict[str, asyncio.Future] = {}
         
     async def initialize(self):
         """Initialize PostgreSQL connection pool."""
@@ -35,14 +211,57 @@ class PostgreSQLStateManager(StateManager):
                 user=parsed.username,
                 password=parsed.password,
                 database=parsed.path[1:] if parsed.path.startswith('/') else parsed.path,
-                min_size=2,
-                max_size=10,
-                command_timeout=60
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                # Recycle idle connections and fail slow queries fast so
+                # they don't pin a pool slot
+                max_inactive_connection_lifetime=300,
+                command_timeout=10,
+                statement_cache_size=1024,
+                max_cached_statement_lifetime=0,
+                init=self._setup_connection
             )
             
             # Initialize tables
             await self._create_tables()
+
+            # Batch writers for the per-row ingestion hot path
+            self._task_insert_writer = _BatchWriter(self.pool, SQL_INSERT_TASK)
+            self._task_update_writer = _BatchWriter(
+                self.pool, SQL_UPDATE_TASK, key=lambda row: row[3]
+            )
+            self._doc_upsert_writer = _BatchWriter(
+                self.pool, SQL_UPSERT_DOC, key=lambda row: row[0]
+            )
             
+    @staticmethod
+    async def _setup_connection(conn):
+        """Per-connection setup: JSON codecs plus pre-prepared statements."""
+        # Bind json/jsonb straight to Python dicts via orjson so rows
+        # never round-trip through Python-level json.dumps/loads
+        # (binary jsonb carries a one-byte version prefix)
+        await conn.set_type_codec(
+            'jsonb',
+            encoder=lambda value: b'\x01' + orjson.dumps(value),
+            decoder=lambda data: orjson.loads(data[1:]),
+            schema='pg_catalog',
+            format='binary'
+        )
+        await conn.set_type_codec(
+            'json',
+            encoder=orjson.dumps,
+            decoder=orjson.loads,
+            schema='pg_catalog',
+            format='binary'
+        )
+
+        for sql in (
+            SQL_INSERT_TASK, SQL_UPDATE_TASK, SQL_UPDATE_TASK_RETURNING, SQL_GET_TASK,
+            SQL_LIST_TASKS, SQL_LIST_TASKS_FILTERED,
+            SQL_UPSERT_DOC, SQL_GET_DOC
+        ):
+            await conn.prepare(sql)
+
     async def _create_tables(self):
         """Create necessary tables if they don't exist."""
         async with self.pool.acquire() as conn:
@@ -78,11 +297,52 @@ class PostgreSQLStateManager(StateManager):
                 )
             """)
             
-            # Create indexes
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+            # Create indexes - composites match the list queries'
+            # filter + created_at DESC sort, so they plan as pure index
+            # scans instead of bitmap scans with a separate sort
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at DESC)"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_source_created ON documents(source_type, created_at DESC)"
+            )
+            # jsonb_path_ops GIN keeps metadata @> containment filters
+            # on the index instead of scanning every row
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_metadata_gin ON documents USING gin (metadata jsonb_path_ops)"
+            )
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)")
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status)")
+            # The composite's status prefix makes the single-column index redundant
+            await conn.execute("DROP INDEX IF EXISTS idx_tasks_status")
             
+    def _cache_get(self, cache: OrderedDict, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached row if present and fresh."""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            cache.pop(key, None)
+            return None
+        cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, cache: OrderedDict, key: str, value: Dict[str, Any], ttl: float):
+        """Store a row with a TTL, evicting the LRU entry when full."""
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        while len(cache) > self.CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+    def get_pool_stats(self) -> Dict[str, int]:
+        """Report pool utilization (useful at health checks)."""
+        if self.pool is None:
+            return {"size": 0, "idle": 0}
+        stats = {"size": self.pool.get_size(), "idle": self.pool.get_idle_size()}
+        logger.debug(f"PostgreSQL pool: {stats['size']} connections, {stats['idle']} idle")
+        return stats
+
     async def create_task_record(
         self,
         task_id: str,
@@ -93,13 +353,10 @@ class PostgreSQLStateManager(StateManager):
     ) -> bool:
         """Create initial task record."""
         try:
-            async with self.pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO tasks (id, task_type, status, source_location, source_type, metadata)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                """, task_id, task_type, TaskStatus.QUEUED.value, source_location, 
-                    source_type.value, json.dumps(metadata) if metadata else None)
-                return True
+            return await self._task_insert_writer.submit((
+                task_id, task_type, TaskStatus.QUEUED.value, source_location,
+                source_type.value, metadata
+            ))
         except Exception as e:
             logger.error(f"Failed to create task record {task_id}: {e}")
             return False
@@ -113,42 +370,108 @@ class PostgreSQLStateManager(StateManager):
     ) -> bool:
         """Update task status."""
         try:
-            async with self.pool.acquire() as conn:
-                await conn.execute("""
-                    UPDATE tasks 
-                    SET status = $1, error_message = $2, result_data = $3, updated_at = NOW()
-                    WHERE id = $4
-                """, status.value, error_message, 
-                    json.dumps(result_data) if result_data else None, task_id)
-                return True
+            # Invalidate before the write lands so pollers never read a
+            # stale status past the batch flush
+            self._task_cache.pop(task_id, None)
+            return await self._task_update_writer.submit((
+                status.value, error_message,
+                result_data, task_id
+            ))
         except Exception as e:
             logger.error(f"Failed to update task status {task_id}: {e}")
             return False
     
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get current task status and details."""
+        cached = self._cache_get(self._task_cache, task_id)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight_tasks.get(task_id)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_tasks[task_id] = future
         try:
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT id, task_type, status, source_location, source_type, 
-                           metadata, error_message, result_data, created_at, updated_at
-                    FROM tasks WHERE id = $1
-                """, task_id)
-                
-                if row:
-                    return {
-                        "id": row["id"],
-                        "task_type": row["task_type"],
-                        "status": row["status"],
-                        "source_location": row["source_location"],
-                        "source_type": row["source_type"],
-                        "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-                        "error_message": row["error_message"],
-                        "result_data": json.loads(row["result_data"]) if row["result_data"] else {},
-                        "created_at": row["created_at"],
-                        "updated_at": row["updated_at"]
-                    }
-                return None
+            result = await self._fetch_task_status(task_id)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight_tasks.pop(task_id, None)
+            if not future.done():
+                future.set_result(None)
+
+    @staticmethod
+    def _task_row_to_dict(row) -> Dict[str, Any]:
+        """Convert a task Record to a dict in one C-level call.
+
+        asyncpg Records iterate as (key, value) pairs, so dict(row)
+        avoids the per-field Python assembly loop; only the nullable
+        JSONB columns need patching afterwards.
+        """
+        task = dict(row)
+        if task["metadata"] is None:
+            task["metadata"] = {}
+        if task["result_data"] is None:
+            task["result_data"] = {}
+        return task
+
+    @staticmethod
+    def _doc_row_to_dict(row) -> Dict[str, Any]:
+        """Convert a document Record to a dict in one C-level call."""
+        document = dict(row)
+        if document["metadata"] is None:
+            document["metadata"] = {}
+        if document["chunk_ids"] is None:
+            document["chunk_ids"] = []
+        if document["file_paths"] is None:
+            document["file_paths"] = []
+        return document
+
+    def _cache_task_row(self, row) -> Dict[str, Any]:
+        """Convert a task row to a dict and cache it with a status-aware TTL."""
+        task = self._task_row_to_dict(row)
+        ttl = (
+            self.TERMINAL_CACHE_TTL
+            if task["status"] in self._TERMINAL_STATUSES
+            else self.CACHE_TTL
+        )
+        self._cache_put(self._task_cache, task["id"], task, ttl)
+        return task
+
+    async def update_and_get_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        error_message: Optional[str] = None,
+        result_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Update task status and return the full row in one round-trip.
+        
+        Uses UPDATE ... RETURNING so update-then-read status transitions
+        cost a single round-trip instead of two.
+        """
+        try:
+            row = await self.pool.fetchrow(
+                SQL_UPDATE_TASK_RETURNING,
+                status.value, error_message, result_data, task_id
+            )
+            if row:
+                return self._cache_task_row(row)
+            self._task_cache.pop(task_id, None)
+            return None
+        except Exception as e:
+            logger.error(f"Failed to update task status {task_id}: {e}")
+            return None
+
+    async def _fetch_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a task row from the database and cache it."""
+        try:
+            row = await self.pool.fetchrow(SQL_GET_TASK, task_id)
+            if row:
+                return self._cache_task_row(row)
+            return None
         except Exception as e:
             logger.error(f"Failed to get task status {task_id}: {e}")
             return None
@@ -161,39 +484,23 @@ class PostgreSQLStateManager(StateManager):
     ) -> List[Dict[str, Any]]:
         """List tasks with optional filtering."""
         try:
+            tasks = []
             async with self.pool.acquire() as conn:
-                if status_filter:
-                    rows = await conn.fetch("""
-                        SELECT id, task_type, status, source_location, source_type,
-                               metadata, error_message, result_data, created_at, updated_at
-                        FROM tasks WHERE status = $1
-                        ORDER BY created_at DESC
-                        LIMIT $2 OFFSET $3
-                    """, status_filter.value, limit, offset)
-                else:
-                    rows = await conn.fetch("""
-                        SELECT id, task_type, status, source_location, source_type,
-                               metadata, error_message, result_data, created_at, updated_at
-                        FROM tasks
-                        ORDER BY created_at DESC
-                        LIMIT $1 OFFSET $2
-                    """, limit, offset)
-                
-                tasks = []
-                for row in rows:
-                    tasks.append({
-                        "id": row["id"],
-                        "task_type": row["task_type"],
-                        "status": row["status"],
-                        "source_location": row["source_location"],
-                        "source_type": row["source_type"],
-                        "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-                        "error_message": row["error_message"],
-                        "result_data": json.loads(row["result_data"]) if row["result_data"] else {},
-                        "created_at": row["created_at"],
-                        "updated_at": row["updated_at"]
-                    })
-                return tasks
+                # Stream rows through a server-side cursor so arbitrary
+                # caller limits don't buffer the whole result set twice
+                async with conn.transaction():
+                    if status_filter:
+                        cursor = conn.cursor(
+                            SQL_LIST_TASKS_FILTERED,
+                            status_filter.value, limit, offset,
+                            prefetch=64
+                        )
+                    else:
+                        cursor = conn.cursor(SQL_LIST_TASKS, limit, offset, prefetch=64)
+
+                    async for row in cursor:
+                        tasks.append(self._task_row_to_dict(row))
+            return tasks
         except Exception as e:
             logger.error(f"Failed to list tasks: {e}")
             return []
@@ -210,48 +517,141 @@ class PostgreSQLStateManager(StateManager):
     ) -> bool:
         """Store document record."""
         try:
-            async with self.pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO documents (id, title, source_location, source_type, metadata, chunk_ids, file_paths)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                    ON CONFLICT (id) DO UPDATE SET
-                        title = EXCLUDED.title,
-                        metadata = EXCLUDED.metadata,
-                        chunk_ids = EXCLUDED.chunk_ids,
-                        file_paths = EXCLUDED.file_paths,
-                        updated_at = NOW()
-                """, document_id, title, source_location, source_type.value,
-                    json.dumps(metadata) if metadata else None,
-                    chunk_ids or [], file_paths or [])
-                return True
+            self._doc_cache.pop(document_id, None)
+            return await self._doc_upsert_writer.submit((
+                document_id, title, source_location, source_type.value,
+                metadata, chunk_ids or [], file_paths or []
+            ))
         except Exception as e:
             logger.error(f"Failed to store document record {document_id}: {e}")
             return False
     
+    async def list_documents(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        source: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List document records with one round-trip.
+
+        Filters, orders, paginates and counts in a single query (the
+        total rides along as a window aggregate), replacing the legacy
+        list_keys + per-id get_state N+1 pattern.
+
+        Args:
+            limit: Maximum number of results
+            offset: Result offset for pagination
+            source: Optional source_type filter
+            metadata_filter: Optional JSONB containment filter, matched
+                with @> against the GIN-indexed metadata column
+
+        Returns:
+            Tuple of (document rows, total matching count)
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    SQL_LIST_DOCS, limit, offset, source, metadata_filter
+                )
+
+                if rows:
+                    total = rows[0]["total_count"]
+                else:
+                    # Page past the end - still report the real total
+                    total = await conn.fetchval(
+                        "SELECT COUNT(*) FROM documents "
+                        "WHERE ($1::text IS NULL OR source_type = $1) "
+                        "AND ($2::jsonb IS NULL OR metadata @> $2)",
+                        source, metadata_filter
+                    )
+
+                documents = [self._doc_row_to_dict(row) for row in rows]
+                for document in documents:
+                    document.pop("total_count", None)
+                return documents, total
+        except Exception as e:
+            logger.error(f"Failed to list documents: {e}")
+            return [], 0
+
+    async def bulk_store_documents(self, documents: List[Dict[str, Any]]) -> bool:
+        """
+        Bulk-insert document records via PostgreSQL's binary COPY protocol.
+
+        COPYs the batch into a temporary staging table and merges it with
+        one INSERT ... ON CONFLICT, so an N-document import costs one
+        round-trip instead of N per-row upserts.
+
+        Args:
+            documents: Dicts with the store_document_record fields
+                (id, title, source_location, source_type, metadata,
+                chunk_ids, file_paths)
+
+        Returns:
+            True if the batch was stored
+        """
+        if not documents:
+            return True
+
+        records = [
+            (
+                doc['id'],
+                doc.get('title'),
+                doc.get('source_location'),
+                doc['source_type'].value if hasattr(doc.get('source_type'), 'value') else doc.get('source_type'),
+                doc.get('metadata'),
+                doc.get('chunk_ids') or [],
+                doc.get('file_paths') or []
+            )
+            for doc in documents
+        ]
+
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("""
+                        CREATE TEMP TABLE documents_staging
+                        (LIKE documents INCLUDING DEFAULTS)
+                        ON COMMIT DROP
+                    """)
+                    await conn.copy_records_to_table(
+                        'documents_staging',
+                        records=records,
+                        columns=[
+                            'id', 'title', 'source_location', 'source_type',
+                            'metadata', 'chunk_ids', 'file_paths'
+                        ]
+                    )
+                    await conn.execute("""
+                        INSERT INTO documents (id, title, source_location, source_type, metadata, chunk_ids, file_paths)
+                        SELECT id, title, source_location, source_type, metadata, chunk_ids, file_paths
+                        FROM documents_staging
+                        ON CONFLICT (id) DO UPDATE SET
+                            title = EXCLUDED.title,
+                            metadata = EXCLUDED.metadata,
+                            chunk_ids = EXCLUDED.chunk_ids,
+                            file_paths = EXCLUDED.file_paths,
+                            updated_at = NOW()
+                    """)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to bulk store {len(documents)} documents: {e}")
+            return False
+
     async def get_document_record(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get document record."""
         try:
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT id, title, source_location, source_type, metadata, 
-                           status, chunk_ids, file_paths, created_at, updated_at
-                    FROM documents WHERE id = $1
-                """, document_id)
-                
-                if row:
-                    return {
-                        "id": row["id"],
-                        "title": row["title"],
-                        "source_location": row["source_location"],
-                        "source_type": row["source_type"],
-                        "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-                        "status": row["status"],
-                        "chunk_ids": row["chunk_ids"] or [],
-                        "file_paths": row["file_paths"] or [],
-                        "created_at": row["created_at"],
-                        "updated_at": row["updated_at"]
-                    }
-                return None
+            cached = self._cache_get(self._doc_cache, document_id)
+            if cached is not None:
+                return cached
+
+            row = await self.pool.fetchrow(SQL_GET_DOC, document_id)
+            if row:
+                document = self._doc_row_to_dict(row)
+                self._cache_put(self._doc_cache, document_id, document, self.CACHE_TTL)
+                return document
+            return None
         except Exception as e:
             logger.error(f"Failed to get document record {document_id}: {e}")
             return None
@@ -273,17 +673,16 @@ class PostgreSQLStateManager(StateManager):
             if key.startswith("task:"):
                 task_id = key[5:]
                 # This is a simplified approach - in practice you'd want proper task creation
-                async with self.pool.acquire() as conn:
-                    await conn.execute("""
-                        INSERT INTO tasks (id, task_type, status, metadata)
-                        VALUES ($1, $2, $3, $4)
-                        ON CONFLICT (id) DO UPDATE SET
-                            metadata = EXCLUDED.metadata,
-                            updated_at = NOW()
-                    """, task_id, 
-                        data.get("task_type", "unknown"),
-                        data.get("status", "QUEUED"),
-                        json.dumps(data))
+                await self.pool.execute("""
+                    INSERT INTO tasks (id, task_type, status, metadata)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (id) DO UPDATE SET
+                        metadata = EXCLUDED.metadata,
+                        updated_at = NOW()
+                """, task_id, 
+                    data.get("task_type", "unknown"),
+                    data.get("status", "QUEUED"),
+                    data)
                 return True
             elif key.startswith("document:"):
                 doc_id = key[9:]
@@ -304,29 +703,45 @@ class PostgreSQLStateManager(StateManager):
     async def delete_state(self, key: str) -> bool:
         """Delete state by key (legacy compatibility)."""
         try:
-            async with self.pool.acquire() as conn:
-                if key.startswith("task:"):
-                    task_id = key[5:]
-                    await conn.execute("DELETE FROM tasks WHERE id = $1", task_id)
-                elif key.startswith("document:"):
-                    doc_id = key[9:]
-                    await conn.execute("DELETE FROM documents WHERE id = $1", doc_id)
-                return True
+            if key.startswith("task:"):
+                task_id = key[5:]
+                self._task_cache.pop(task_id, None)
+                await self.pool.execute("DELETE FROM tasks WHERE id = $1", task_id)
+            elif key.startswith("document:"):
+                doc_id = key[9:]
+                self._doc_cache.pop(doc_id, None)
+                await self.pool.execute("DELETE FROM documents WHERE id = $1", doc_id)
+            return True
         except Exception as e:
             logger.error(f"Failed to delete state for {key}: {e}")
             return False
     
-    async def list_keys(self, prefix: str = "") -> List[str]:
-        """List keys with prefix (legacy compatibility)."""
+    async def list_keys(
+        self,
+        prefix: str = "",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[str]:
+        """List keys with prefix (legacy compatibility).
+
+        Pushes limit/offset into SQL so a page of keys never transfers
+        the whole table; limit=None preserves the old full-scan behavior.
+        """
         try:
-            async with self.pool.acquire() as conn:
-                if prefix == "task:":
-                    rows = await conn.fetch("SELECT id FROM tasks ORDER BY created_at DESC")
-                    return [f"task:{row['id']}" for row in rows]
-                elif prefix == "document:":
-                    rows = await conn.fetch("SELECT id FROM documents ORDER BY created_at DESC")
-                    return [f"document:{row['id']}" for row in rows]
-                return []
+            # NULL limit means "no limit" server-side
+            if prefix == "task:":
+                rows = await self.pool.fetch(
+                    "SELECT id FROM tasks ORDER BY created_at DESC LIMIT $1 OFFSET $2",
+                    limit, offset
+                )
+                return [f"task:{row['id']}" for row in rows]
+            elif prefix == "document:":
+                rows = await self.pool.fetch(
+                    "SELECT id FROM documents ORDER BY created_at DESC LIMIT $1 OFFSET $2",
+                    limit, offset
+                )
+                return [f"document:{row['id']}" for row in rows]
+            return []
         except Exception as e:
             logger.error(f"Failed to list keys with prefix {prefix}: {e}")
             return []
\ No newline at end of file
@@ -4,13 +4,14 @@ FastAPI application for RAG knowledge base.
 
 import asyncio
 import logging
+from datetime import datetime
 from typing import Dict, Any, List
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import uvicorn
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from uuid import uuid4
 
 from .config import ConfigManager
 from .factory import ServiceFactory
@@ -32,16 +33,28 @@ query_engine: QueryEngine = None
 upload_service: UploadService = None
 processing_service: ProcessingService = None
 
+# Health payload precomputed at startup - the services map doesn't
+# mutate after lifespan, so load balancers get a cached response
+_health_response: Dict[str, Any] = None
+
+# Static liveness body, served without any per-request allocation
+_LIVE_RESPONSE = b'{"ok":true}'
+
+# Persistent ingestion worker pool - ingestion runs on dedicated tasks
+# so request handlers are never tied up by document processing
+_ingest_queue: asyncio.Queue = None
+_ingest_workers: List[asyncio.Task] = []
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
-    global services, query_engine, upload_service, processing_service
+    global services, query_engine, upload_service, processing_service, _health_response, _ingest_queue
     
     try:
-        # Load configuration
+        # Load configuration off the event loop (reads and parses YAML)
         config_manager = ConfigManager()
-        config = config_manager.load_config()
+        config = await asyncio.to_thread(config_manager.load_config)
         
         # Initialize services
         factory = ServiceFactory(config)
@@ -69,6 +82,30 @@ async def lifespan(app: FastAPI):
             tagging_provider=services.get('tagging_provider')  # Add tagging service
         )
         
+        # Start the ingestion worker pool - a bounded queue drained by
+        # long-running tasks caps concurrent ingests independently of
+        # request concurrency
+        api_config = getattr(config, 'api', None)
+        num_workers = getattr(api_config, 'ingest_workers', 4)
+        queue_size = getattr(api_config, 'ingest_queue_size', 256)
+        _ingest_queue = asyncio.Queue(maxsize=queue_size)
+        for i in range(num_workers):
+            worker = asyncio.create_task(_ingest_worker(), name=f"ingest-worker-{i}")
+            _ingest_workers.append(worker)
+        
+        # Precompute the health payload once - see health_check
+        _health_response = {
+            "status": "healthy",
+            "services": {
+                name: "initialized" if services.get(name) else "not_initialized"
+                for name in (
+                    "embedding_provider", "vector_database", "storage_provider",
+                    "task_queue", "state_manager", "workflow_orchestrator",
+                    "tagging_provider"
+                )
+            }
+        }
+        
         logger.info("Application startup completed")
         yield
         
@@ -77,7 +114,12 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Application shutdown")
-        # Clean up resources if needed
+        # Stop ingestion workers; pending queue items are abandoned
+        for worker in _ingest_workers:
+            worker.cancel()
+        if _ingest_workers:
+            await asyncio.gather(*_ingest_workers, return_exceptions=True)
+        _ingest_workers.clear()
 
 
 # Create FastAPI app
@@ -85,7 +127,8 @@ app = FastAPI(
     title="RAG Knowledge Base API",
     description="A configurable RAG (Retrieval-Augmented Generation) knowledge base with AWS/local service support",
     version="1.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -104,36 +147,22 @@ async def root():
     return {"message": "RAG Knowledge Base API", "version": "1.1.0"}
 
 
+@app.get("/live")
+async def liveness():
+    """Liveness probe - static body, no per-request work."""
+    return Response(content=_LIVE_RESPONSE, media_type="application/json")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    try:
-        # Check if services are initialized
-        if not services:
-            raise HTTPException(status_code=503, detail="Services not initialized")
-            
-        return {
-            "status": "healthy",
-            "services": {
-                "embedding_provider": "initialized" if services.get('embedding_provider') else "not_initialized",
-                "vector_database": "initialized" if services.get('vector_database') else "not_initialized",
-                "storage_provider": "initialized" if services.get('storage_provider') else "not_initialized",
-                "task_queue": "initialized" if services.get('task_queue') else "not_initialized",
-                "state_manager": "initialized" if services.get('state_manager') else "not_initialized",
-                "workflow_orchestrator": "initialized" if services.get('workflow_orchestrator') else "not_initialized",
-                "tagging_provider": "initialized" if services.get('tagging_provider') else "not_initialized"
-            }
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        raise HTTPException(status_code=503, detail=f"Health check failed: {str(e)}")
+    if _health_response is None:
+        raise HTTPException(status_code=503, detail="Services not initialized")
+    return ORJSONResponse(_health_response)
 
 
 @app.post("/api/v1/documents/ingest", response_model=IngestionResponse)
-async def ingest_document(
-    background_tasks: BackgroundTasks,
-    request: IngestionRequest
-):
+async def ingest_document(request: IngestionRequest):
     """Ingest a document for processing."""
     try:
         if not services.get('workflow_orchestrator'):
@@ -144,8 +173,7 @@ async def ingest_document(
         # For URL ingestion, we need to fetch content first
         if request.source_type == SourceType.URL and request.url:
             # This is a simplified version - in production you'd want proper URL fetching
-            import uuid
-            doc_id = str(uuid.uuid4())
+            doc_id = str(uuid4())
             
             # Create document object for URL
             document = Document(
@@ -161,12 +189,8 @@ async def ingest_document(
         else:
             raise HTTPException(status_code=400, detail="URL is required for URL ingestion")
         
-        # Start ingestion task in background
-        background_tasks.add_task(
-            _process_document_async,
-            document,
-            document.id
-        )
+        # Hand off to the ingestion worker pool
+        await _ingest_queue.put((document, document.id))
         
         return IngestionResponse(
             task_id=document.id,
@@ -181,7 +205,6 @@ async def ingest_document(
 
 @app.post("/api/v1/documents/upload", response_model=IngestionResponse)
 async def upload_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     metadata: str = "{}"
 ):
@@ -196,12 +219,9 @@ async def upload_document(
         # Use UploadService to handle file upload
         document, task_id = await upload_service.process_file_upload(file, metadata)
         
-        # Start background task for document processing (vectorization, indexing, etc.)
-        background_tasks.add_task(
-            _process_document_async,
-            document,
-            task_id
-        )
+        # Hand off to the ingestion worker pool for processing
+        # (vectorization, indexing, etc.)
+        await _ingest_queue.put((document, task_id))
         
         return IngestionResponse(
             task_id=task_id,
@@ -258,17 +278,11 @@ async def get_task_status(task_id: str):
         }
         status = status_mapping.get(task_info.get('status', ''), 'queued')
         
-        # Process time fields
-        from datetime import datetime
+        # Timestamps arrive as tz-aware datetimes from asyncpg; for the
+        # SQLite path pydantic coerces ISO strings during validation
         created_at = task_info.get('created_at')
         updated_at = task_info.get('updated_at')
         
-        # Convert string to datetime object if needed
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-        
         return TaskStatusResponse(
             task_id=task_id,
             status=status,
@@ -299,12 +313,28 @@ async def list_documents(
         
         state_manager = services['state_manager']
         
-        # Get document list from state
-        document_keys = await state_manager.list_keys("document:")
+        # Single-query path when the state manager supports it; the
+        # source filter becomes an indexed JSONB containment match
+        if hasattr(state_manager, 'list_documents'):
+            documents, total = await state_manager.list_documents(
+                limit=limit, offset=offset,
+                metadata_filter={"source": source} if source else None
+            )
+            return {
+                "documents": documents,
+                "total": total,
+                "limit": limit,
+                "offset": offset
+            }
+        
+        # Legacy fallback: list a page of keys and fetch each record
+        document_keys = await state_manager.list_keys(
+            "document:", limit=limit, offset=offset
+        )
         
-        # Apply filtering and pagination
+        # Apply filtering
         documents = []
-        for key in document_keys[offset:offset + limit]:
+        for key in document_keys:
             doc_info = await state_manager.get_state(key)
             if doc_info:
                 if source is None or doc_info.get("source") == source:
@@ -338,20 +368,25 @@ async def delete_document(document_id: str):
         if not doc_info:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        # Delete from vector database
-        chunk_ids = doc_info.get("chunk_ids", [])
-        if chunk_ids:
-            await vector_database.delete_vectors(chunk_ids)
-        
-        # Delete stored files
-        file_paths = doc_info.get("file_paths", [])
-        for file_path in file_paths:
+        async def _delete_file(file_path: str):
             try:
                 await storage_provider.delete_file(file_path)
             except FileNotFoundError:
                 pass  # File already deleted
         
-        # Delete from state manager
+        # Delete chunk vectors and stored files concurrently - they are
+        # independent, so N serial round-trips become one batch
+        chunk_ids = doc_info.get("chunk_ids", [])
+        file_paths = doc_info.get("file_paths", [])
+        
+        cleanup_ops = [_delete_file(file_path) for file_path in file_paths]
+        if chunk_ids:
+            cleanup_ops.append(vector_database.delete_vectors(chunk_ids))
+        
+        if cleanup_ops:
+            await asyncio.gather(*cleanup_ops, return_exceptions=True)
+        
+        # Delete from state manager last so a failed cleanup stays visible
         await state_manager.delete_state(f"document:{document_id}")
         
         return {"message": f"Document {document_id} deleted successfully"}
@@ -363,6 +398,18 @@ async def delete_document(document_id: str):
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
 
 
+async def _ingest_worker():
+    """Long-running worker that drains the ingestion queue."""
+    while True:
+        document, task_id = await _ingest_queue.get()
+        try:
+            await _process_document_async(document, task_id)
+        except Exception as e:
+            logger.error(f"Ingestion worker error for task {task_id}: {e}")
+        finally:
+            _ingest_queue.task_done()
+
+
 async def _process_document_async(document: Document, task_id: str):
     """Background task to process document using ProcessingService."""
     if not processing_service:
@@ -392,6 +439,8 @@ async def global_exception_handler(request, exc):
 
 def run_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = False):
     """Run the FastAPI server."""
+    import uvicorn  # deferred - only the server entrypoint needs it
+    
     uvicorn.run(
         "knowledge_base.src.api:app",
         host=host,
@@ -2,14 +2,130 @@
 Configuration management system supporting both YAML files and environment variables.
 """
 
+import copy
 import os
-import yaml
+from functools import lru_cache
 from typing import Any, Dict, Optional, Union
 from pathlib import Path
 from pydantic import BaseModel, Field
 from enum import Enum
 
 
+# Default config directory, resolved once - saves the triple parent
+# traversal on every ConfigManager instantiation
+_CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / "config"
+
+# Environment variables consulted by _apply_env_overrides - used to
+# fingerprint the environment for the assembled-config cache below
+_CONFIG_ENV_VARS = (
+    "ENVIRONMENT", "DEBUG",
+    "EMBEDDING_PROVIDER", "EMBEDDING_MODEL_NAME", "BEDROCK_MODEL_ID",
+    "AWS_REGION", "VECTOR_DB_PROVIDER", "CHROMADB_PERSIST_DIR",
+    "OPENSEARCH_ENDPOINT", "STORAGE_PROVIDER", "LOCAL_STORAGE_PATH",
+    "S3_BUCKET", "TASK_QUEUE_PROVIDER", "REDIS_URL", "SQS_QUEUE_URL",
+    "STATE_MANAGER_PROVIDER", "SQLITE_PATH", "DATABASE_URL",
+    "DYNAMODB_TABLE_NAME", "WORKFLOW_PROVIDER", "STEP_FUNCTIONS_ARN",
+    "API_HOST", "API_PORT", "API_WORKERS", "API_RELOAD", "LOG_LEVEL",
+)
+
+# Assembled AppConfig instances keyed by (path, mtime, env fingerprint)
+# so additional ConfigManager instances (reload mode, extra workers,
+# tests) reuse the validated config instead of re-parsing
+_config_cache: Dict[tuple, "AppConfig"] = {}
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file, memoized on (path, mtime).
+    
+    The file is slurped in one read so libyaml scans a contiguous
+    buffer instead of bouncing back into Python for stream chunks;
+    config files are a few KB at most. PyYAML itself is imported
+    lazily here - env-only deployments never pay its import time and
+    resolver-regex memory.
+    """
+    import yaml
+    
+    # libyaml-backed loader when available - parses 5-15x faster than
+    # the pure-Python SafeLoader
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    data = Path(path).read_bytes()
+    return yaml.load(data, Loader=loader) or {}
+
+
+def _env_fingerprint() -> tuple:
+    """Snapshot the override-relevant environment variables."""
+    env = os.environ.copy()
+    return tuple(env.get(name) for name in _CONFIG_ENV_VARS)
+
+
+def _as_bool(value: str) -> bool:
+    """Convert an environment string to a boolean."""
+    return value.lower() in ("true", "1", "yes", "on")
+
+
+def _as_int(value: str) -> Optional[int]:
+    """Convert an environment string to an int, None if malformed."""
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+# Env override table: (pre-split config key path, env var, converter).
+# A flat constant tuple iterated once per load - missing variables are
+# skipped without building a scratch dict of mostly-None entries, and
+# the key paths are tupled at import so the hot path never splits
+_ENV_OVERRIDES = (
+    # General settings
+    (("environment",), "ENVIRONMENT", str),
+    (("debug",), "DEBUG", _as_bool),
+    
+    # Embedding configuration
+    (("embedding", "provider"), "EMBEDDING_PROVIDER", str),
+    (("embedding", "model_name"), "EMBEDDING_MODEL_NAME", str),
+    (("embedding", "bedrock_model_id"), "BEDROCK_MODEL_ID", str),
+    (("embedding", "aws_region"), "AWS_REGION", str),
+    
+    # Vector database configuration
+    (("vector_database", "provider"), "VECTOR_DB_PROVIDER", str),
+    (("vector_database", "persist_directory"), "CHROMADB_PERSIST_DIR", str),
+    (("vector_database", "opensearch_endpoint"), "OPENSEARCH_ENDPOINT", str),
+    (("vector_database", "aws_region"), "AWS_REGION", str),
+    
+    # Storage configuration
+    (("storage", "provider"), "STORAGE_PROVIDER", str),
+    (("storage", "local_storage_path"), "LOCAL_STORAGE_PATH", str),
+    (("storage", "s3_bucket"), "S3_BUCKET", str),
+    (("storage", "aws_region"), "AWS_REGION", str),
+    
+    # Task queue configuration
+    (("task_queue", "provider"), "TASK_QUEUE_PROVIDER", str),
+    (("task_queue", "redis_url"), "REDIS_URL", str),
+    (("task_queue", "sqs_queue_url"), "SQS_QUEUE_URL", str),
+    (("task_queue", "aws_region"), "AWS_REGION", str),
+    
+    # State manager configuration
+    (("state_manager", "provider"), "STATE_MANAGER_PROVIDER", str),
+    (("state_manager", "sqlite_path"), "SQLITE_PATH", str),
+    (("state_manager", "postgresql_url"), "DATABASE_URL", str),
+    (("state_manager", "dynamodb_table_name"), "DYNAMODB_TABLE_NAME", str),
+    (("state_manager", "aws_region"), "AWS_REGION", str),
+    
+    # Workflow configuration
+    (("workflow", "provider"), "WORKFLOW_PROVIDER", str),
+    (("workflow", "state_machine_arn"), "STEP_FUNCTIONS_ARN", str),
+    (("workflow", "aws_region"), "AWS_REGION", str),
+    
+    # API configuration
+    (("api", "host"), "API_HOST", str),
+    (("api", "port"), "API_PORT", _as_int),
+    (("api", "workers"), "API_WORKERS", _as_int),
+    (("api", "reload"), "API_RELOAD", _as_bool),
+    (("api", "log_level"), "LOG_LEVEL", str),
+)
+
+
 class Environment(str, Enum):
     """Environment types"""
     LOCAL = "local"
@@ -94,6 +210,8 @@ class StateManagerConfig(BaseModel):
     
     # PostgreSQL settings
     database_url: Optional[str] = Field(None, description="PostgreSQL connection URL")
+    pool_min_size: int = Field(10, description="Minimum PostgreSQL pool connections")
+    pool_max_size: int = Field(50, description="Maximum PostgreSQL pool connections")
     
     # DynamoDB settings (AWS)
     table_name: Optional[str] = Field(None, description="DynamoDB table name")
@@ -137,6 +255,8 @@ class APIConfig(BaseModel):
     workers: int = Field(1, description="Number of worker processes")
     reload: bool = Field(False, description="Enable auto-reload in development")
     log_level: str = Field("info", description="Logging level")
+    ingest_workers: int = Field(4, description="Number of background ingestion worker tasks")
+    ingest_queue_size: int = Field(256, description="Maximum queued ingestion jobs before uploads block")
 
 
 class AppConfig(BaseModel):
@@ -165,22 +285,41 @@ class ConfigManager:
     
     def _get_default_config_file(self) -> str:
         """Get default configuration file based on environment"""
-        config_dir = Path(__file__).parent.parent.parent / "config"
-        return str(config_dir / f"{self.environment}.yaml")
+        return str(_CONFIG_DIR / f"{self.environment}.yaml")
     
     def load_config(self) -> AppConfig:
         """Load configuration from file and environment variables"""
         if self._config is not None:
             return self._config
         
-        # Load base configuration from YAML file
-        config_data = self._load_yaml_config()
+        config_path = Path(self.config_file)
+        config_exists = config_path.exists()
+        if not config_exists and os.environ.get("ALLOW_MISSING_YAML_CONFIG") != "1":
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        
+        # Reuse a previously assembled config when the file and the
+        # relevant environment variables are unchanged
+        cache_key = (
+            str(config_path.resolve()),
+            config_path.stat().st_mtime_ns if config_exists else 0,
+            _env_fingerprint()
+        )
+        cached = _config_cache.get(cache_key)
+        if cached is not None:
+            self._config = cached
+            return cached
+        
+        # Load base configuration from YAML file; env-only deployments
+        # (ALLOW_MISSING_YAML_CONFIG=1) skip YAML - and its import -
+        # entirely
+        config_data = self._load_yaml_config() if config_exists else {}
         
         # Override with environment variables
         config_data = self._apply_env_overrides(config_data)
         
         # Create and validate configuration
         self._config = AppConfig(**config_data)
+        _config_cache[cache_key] = self._config
         return self._config
     
     def _load_yaml_config(self) -> Dict[str, Any]:
@@ -190,89 +329,30 @@ class ConfigManager:
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+        # Deep-copy out of the parse cache - env overrides mutate the
+        # tree in place and must not leak into other managers
+        parsed = _parse_yaml(str(config_path), config_path.stat().st_mtime_ns)
+        return copy.deepcopy(parsed)
     
     def _apply_env_overrides(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply environment variable overrides to configuration"""
-        
-        # Environment-specific overrides
-        env_overrides = {
-            # General settings
-            "environment": os.getenv("ENVIRONMENT"),
-            "debug": self._get_bool_env("DEBUG"),
-            
-            # Embedding configuration
-            "embedding.provider": os.getenv("EMBEDDING_PROVIDER"),
-            "embedding.model_name": os.getenv("EMBEDDING_MODEL_NAME"),
-            "embedding.bedrock_model_id": os.getenv("BEDROCK_MODEL_ID"),
-            "embedding.aws_region": os.getenv("AWS_REGION"),
-            
-            # Vector database configuration
-            "vector_database.provider": os.getenv("VECTOR_DB_PROVIDER"),
-            "vector_database.persist_directory": os.getenv("CHROMADB_PERSIST_DIR"),
-            "vector_database.opensearch_endpoint": os.getenv("OPENSEARCH_ENDPOINT"),
-            "vector_database.aws_region": os.getenv("AWS_REGION"),
-            
-            # Storage configuration
-            "storage.provider": os.getenv("STORAGE_PROVIDER"),
-            "storage.local_storage_path": os.getenv("LOCAL_STORAGE_PATH"),
-            "storage.s3_bucket": os.getenv("S3_BUCKET"),
-            "storage.aws_region": os.getenv("AWS_REGION"),
-            
-            # Task queue configuration
-            "task_queue.provider": os.getenv("TASK_QUEUE_PROVIDER"),
-            "task_queue.redis_url": os.getenv("REDIS_URL"),
-            "task_queue.sqs_queue_url": os.getenv("SQS_QUEUE_URL"),
-            "task_queue.aws_region": os.getenv("AWS_REGION"),
-            
-            # State manager configuration
-            "state_manager.provider": os.getenv("STATE_MANAGER_PROVIDER"),
-            "state_manager.sqlite_path": os.getenv("SQLITE_PATH"),
-            "state_manager.postgresql_url": os.getenv("DATABASE_URL"),
-            "state_manager.dynamodb_table_name": os.getenv("DYNAMODB_TABLE_NAME"),
-            "state_manager.aws_region": os.getenv("AWS_REGION"),
-            
-            # Workflow configuration
-            "workflow.provider": os.getenv("WORKFLOW_PROVIDER"),
-            "workflow.state_machine_arn": os.getenv("STEP_FUNCTIONS_ARN"),
-            "workflow.aws_region": os.getenv("AWS_REGION"),
-            
-            # API configuration
-            "api.host": os.getenv("API_HOST"),
-            "api.port": self._get_int_env("API_PORT"),
-            "api.workers": self._get_int_env("API_WORKERS"),
-            "api.reload": self._get_bool_env("API_RELOAD"),
-            "api.log_level": os.getenv("LOG_LEVEL"),
-        }
-        
-        # Apply non-None overrides
-        for key, value in env_overrides.items():
-            if value is not None:
-                self._set_nested_value(config_data, key, value)
+        # One snapshot, then plain dict gets - os.environ's mapping
+        # proxy re-encodes keys on every access
+        env = os.environ.copy()
+        for key_path, env_var, convert in _ENV_OVERRIDES:
+            value = env.get(env_var)
+            if value is None:
+                continue
+            converted = convert(value)
+            if converted is None:
+                # Malformed numeric override - keep the file value
+                continue
+            self._set_nested_value(config_data, key_path, converted)
         
         return config_data
     
-    def _get_bool_env(self, key: str, default: Optional[bool] = None) -> Optional[bool]:
-        """Get boolean value from environment variable"""
-        value = os.getenv(key)
-        if value is None:
-            return default
-        return value.lower() in ("true", "1", "yes", "on")
-    
-    def _get_int_env(self, key: str, default: Optional[int] = None) -> Optional[int]:
-        """Get integer value from environment variable"""
-        value = os.getenv(key)
-        if value is None:
-            return default
-        try:
-            return int(value)
-        except ValueError:
-            return default
-    
-    def _set_nested_value(self, config_data: Dict[str, Any], key: str, value: Any) -> None:
-        """Set nested dictionary value using dot notation"""
-        keys = key.split('.')
+    def _set_nested_value(self, config_data: Dict[str, Any], keys: tuple, value: Any) -> None:
+        """Set nested dictionary value from a pre-split key path"""
         current = config_data
         
         for k in keys[:-1]:
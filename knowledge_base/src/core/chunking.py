@@ -2,9 +2,10 @@
 Text Chunking Module - responsible for splitting text into appropriately sized chunks
 """
 
+import asyncio
 import logging
 import re
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,16 @@ class ChunkConfig:
 class TextChunker:
     """Text chunker"""
     
+    # Precompiled at class scope - re.sub's internal cache still pays
+    # a lookup and tuple hash per call
+    _WS_RE = re.compile(r'\s+')
+    
+    # Boundary character sets for _find_overlap_boundary; the ASCII
+    # sentence marks only count when followed by a space
+    _SENTENCE_CHARS = frozenset("。！？")
+    _ASCII_SENTENCE_CHARS = frozenset(".!?")
+    _WORD_CHARS = frozenset(",， ")
+    
     def __init__(
         self, 
         chunk_size: int = 1000, 
@@ -55,12 +66,20 @@ class TextChunker:
         """
         Split text into chunks
         
+        The splitting itself is pure CPU work with no await points, so
+        it runs on a worker thread to keep the event loop responsive
+        during large ingestions.
+        
         Args:
             text: Text to split
             
         Returns:
             List[str]: List of text chunks
         """
+        return await asyncio.to_thread(self._chunk_text_sync, text)
+    
+    def _chunk_text_sync(self, text: str) -> List[str]:
+        """Synchronous chunking body - see chunk_text."""
         if not text or not text.strip():
             return []
         
@@ -71,14 +90,11 @@ class TextChunker:
         if len(text) <= self.config.chunk_size:
             return [text]
         
-        # Recursively split text
-        chunks = self._split_text_recursive(text, self.config.separators)
-        
-        # Merge small chunks
-        chunks = self._merge_small_chunks(chunks)
+        # Split text, working down the separator hierarchy
+        chunks = self._split_text(text)
         
-        # Handle overlap
-        chunks = self._add_overlap(chunks)
+        # Merge small chunks and add overlap in one fused pass
+        chunks = self._finalize_chunks(chunks)
         
         logger.info(f"Text chunked into {len(chunks)} pieces")
         return chunks
@@ -86,56 +102,81 @@ class TextChunker:
     def _clean_text(self, text: str) -> str:
         """Clean text"""
         # Remove excessive whitespace characters
-        text = re.sub(r'\s+', ' ', text)
+        text = self._WS_RE.sub(' ', text)
         # Remove leading and trailing whitespace
         text = text.strip()
         return text
     
-    def _split_text_recursive(self, text: str, separators: List[str]) -> List[str]:
-        """Recursively split text"""
-        if not separators:
-            # If no separators left, force split by characters
-            return self._split_by_length(text)
+    def _split_text(self, text: str) -> List[str]:
+        """Split text, trying progressively finer separators.
         
-        separator = separators[0]
-        remaining_separators = separators[1:]
-        
-        if separator == "":
-            # Empty string means split by characters
-            return self._split_by_length(text)
-        
-        # Split by current separator
-        splits = text.split(separator)
-        
-        chunks = []
-        current_chunk = ""
+        Runs as an explicit worklist loop instead of recursion - no
+        Python frame per nesting level, no RecursionError on
+        pathological inputs, and no separators[1:] list copy per level.
+        Oversized pieces are pushed back with the next separator index,
+        together with the unprocessed remainder of their segment, so
+        chunks are emitted in document order.
+        """
+        separators = self.config.separators
+        chunk_size = self.config.chunk_size
+        chunks: List[str] = []
+        work = [(text, 0)]
         
-        for i, split in enumerate(splits):
-            # Re-add separator (except for the last one)
-            if i < len(splits) - 1:
-                split_with_sep = split + separator
-            else:
-                split_with_sep = split
+        while work:
+            segment, sep_idx = work.pop()
             
-            # If current chunk plus new split doesn't exceed size limit
-            if len(current_chunk) + len(split_with_sep) <= self.config.chunk_size:
-                current_chunk += split_with_sep
-            else:
+            if sep_idx >= len(separators) or separators[sep_idx] == "":
+                # No separators left - force split by characters
+                chunks.extend(self._split_by_length(segment))
+                continue
+            
+            separator = separators[sep_idx]
+            sep_len = len(separator)
+            splits = segment.split(separator)
+            last = len(splits) - 1
+            
+            buf: List[str] = []
+            buf_len = 0
+            
+            for i, split in enumerate(splits):
+                # Separator is re-added on join (except after the last
+                # piece) - lengths are tracked instead of concatenating
+                # a split+separator string per piece
+                piece_len = len(split) + (sep_len if i < last else 0)
+                
+                if buf_len + piece_len <= chunk_size:
+                    buf.append(split)
+                    if i < last:
+                        buf.append(separator)
+                    buf_len += piece_len
+                    continue
+                
                 # Current chunk is full, save and start new chunk
-                if current_chunk.strip():
-                    chunks.append(current_chunk.strip())
+                chunk = "".join(buf).strip()
+                if chunk:
+                    chunks.append(chunk)
+                buf.clear()
+                buf_len = 0
+                
+                if piece_len > chunk_size:
+                    # Finish the rest of this segment after the
+                    # oversized piece, keeping document order (LIFO:
+                    # last pushed pops first)
+                    rest = separator.join(splits[i + 1:])
+                    if rest:
+                        work.append((rest, sep_idx))
+                    work.append((split + separator if i < last else split, sep_idx + 1))
+                    break
                 
-                # If single split exceeds size limit, need further splitting
-                if len(split_with_sep) > self.config.chunk_size:
-                    sub_chunks = self._split_text_recursive(split_with_sep, remaining_separators)
-                    chunks.extend(sub_chunks)
-                    current_chunk = ""
-                else:
-                    current_chunk = split_with_sep
-        
-        # Add the last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+                buf.append(split)
+                if i < last:
+                    buf.append(separator)
+                buf_len = piece_len
+            else:
+                # Add the last chunk of this segment
+                chunk = "".join(buf).strip()
+                if chunk:
+                    chunks.append(chunk)
         
         return chunks
     
@@ -148,81 +189,86 @@ class TextChunker:
                 chunks.append(chunk)
         return chunks
     
-    def _merge_small_chunks(self, chunks: List[str]) -> List[str]:
-        """Merge small text chunks"""
-        if not chunks:
-            return chunks
-        
-        merged_chunks = []
-        current_chunk = ""
+    def _finalize_chunks(self, chunks: List[str]) -> List[str]:
+        """Merge small chunks and add overlap in one fused pass
         
-        for chunk in chunks:
-            # If chunk is too small, try to merge with previous chunk
-            if len(chunk) < self.config.min_chunk_size:
-                if current_chunk:
-                    # Check if merging would exceed size limit
-                    merged = current_chunk + " " + chunk
-                    if len(merged) <= self.config.chunk_size:
-                        current_chunk = merged
-                    else:
-                        # Cannot merge, save current chunk and start new chunk
-                        merged_chunks.append(current_chunk)
-                        current_chunk = chunk
-                else:
-                    current_chunk = chunk
-            else:
-                # Chunk size is appropriate
-                if current_chunk:
-                    merged_chunks.append(current_chunk)
-                current_chunk = chunk
-        
-        # Add the last chunk
-        if current_chunk:
-            merged_chunks.append(current_chunk)
+        A single traversal applies the small-chunk merge rule and
+        prefixes each emitted chunk (after the first) with the
+        boundary-trimmed tail of the previous one, instead of two
+        passes each building their own intermediate list.
+        """
+        min_size = self.config.min_chunk_size
+        chunk_size = self.config.chunk_size
+        overlap = self.config.chunk_overlap
         
-        return merged_chunks
-    
-    def _add_overlap(self, chunks: List[str]) -> List[str]:
-        """Add overlap to text chunks"""
-        if len(chunks) <= 1 or self.config.chunk_overlap <= 0:
-            return chunks
+        out: List[str] = []
+        prev_raw: Optional[str] = None
+        buf: List[str] = []
+        buf_len = 0
         
-        overlapped_chunks = []
+        def _emit(raw: str) -> None:
+            nonlocal prev_raw
+            if prev_raw is None or overlap <= 0:
+                out.append(raw)
+            else:
+                # Overlap comes from the previous chunk before its own
+                # prefix was added, matching the two-pass behaviour
+                tail = prev_raw[-overlap:] if len(prev_raw) > overlap else prev_raw
+                tail = self._find_overlap_boundary(tail)
+                out.append(f"{tail} {raw}")
+            prev_raw = raw
         
-        for i, chunk in enumerate(chunks):
-            if i == 0:
-                # First chunk doesn't need preceding overlap
-                overlapped_chunks.append(chunk)
+        for chunk in chunks:
+            # If chunk is too small, try to merge with the pending one
+            if len(chunk) < min_size:
+                if buf:
+                    # +1 for the joining space
+                    if buf_len + 1 + len(chunk) <= chunk_size:
+                        buf.append(chunk)
+                        buf_len += 1 + len(chunk)
+                        continue
+                    _emit(" ".join(buf))
+                buf = [chunk]
+                buf_len = len(chunk)
             else:
-                # Get overlap content from the end of previous chunk
-                prev_chunk = chunks[i - 1]
-                overlap_text = prev_chunk[-self.config.chunk_overlap:] if len(prev_chunk) > self.config.chunk_overlap else prev_chunk
-                
-                # Find appropriate overlap boundary (preferably at sentence or word boundary)
-                overlap_text = self._find_overlap_boundary(overlap_text)
-                
-                # Build chunk with overlap
-                overlapped_chunk = overlap_text + " " + chunk
-                overlapped_chunks.append(overlapped_chunk)
+                # Chunk size is appropriate - flush any pending merge
+                if buf:
+                    _emit(" ".join(buf))
+                buf = [chunk]
+                buf_len = len(chunk)
+        
+        # Emit the last chunk
+        if buf:
+            _emit(" ".join(buf))
         
-        return overlapped_chunks
+        return out
     
     def _find_overlap_boundary(self, overlap_text: str) -> str:
-        """Find appropriate overlap boundary"""
+        """Find appropriate overlap boundary
+        
+        One right-to-left scan tracks the rightmost sentence and word
+        separators simultaneously, replacing up to nine full rfind
+        passes over the same text.
+        """
         if not overlap_text:
             return ""
         
-        # Try to cut at sentence boundaries
-        for sep in ["。", "！", "？", ". ", "! ", "? "]:
-            idx = overlap_text.rfind(sep)
-            if idx > 0:
-                return overlap_text[:idx + len(sep)]
-        
-        # If no sentence boundary found, try word boundaries
-        for sep in [",", "，", " "]:
-            idx = overlap_text.rfind(sep)
-            if idx > 0:
-                return overlap_text[:idx + len(sep)]
+        n = len(overlap_text)
+        word_idx = -1
+        
+        for i in range(n - 1, 0, -1):
+            ch = overlap_text[i]
+            # Cut at the rightmost sentence boundary
+            if ch in self._SENTENCE_CHARS:
+                return overlap_text[:i + 1]
+            if ch in self._ASCII_SENTENCE_CHARS and i + 1 < n and overlap_text[i + 1] == ' ':
+                return overlap_text[:i + 2]
+            # Remember the rightmost word boundary as fallback
+            if word_idx < 0 and ch in self._WORD_CHARS:
+                word_idx = i
+        
+        if word_idx > 0:
+            return overlap_text[:word_idx + 1]
         
         # If none found, return original text
         return overlap_text
@@ -2,29 +2,67 @@
 Core data models for the RAG pipeline.
 """
 
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field, PlainSerializer
 from enum import Enum
 
 from src.abstractions import TaskStatus, SourceType, TagResult
 
+# Shared ISO-8601 serialization for datetime fields - one annotated
+# type instead of a json_encoders dict and lambda per model Config,
+# and v2's field serializers are faster than the legacy encoder table
+IsoDatetime = Annotated[
+    datetime, PlainSerializer(lambda v: v.isoformat(), return_type=str)
+]
+
+
+_now_value: Optional[datetime] = None
+_now_stamp_ns: int = 0
 
-class DocumentChunk(BaseModel):
+
+def _utcnow() -> datetime:
+    """datetime.utcnow memoized over ~1ms windows.
+    
+    Batch ingestion constructs thousands of models whose created_at/
+    updated_at defaults each built a fresh datetime; within a 1ms
+    window they all share one. A monotonic_ns read is far cheaper
+    than datetime construction, and a benign race just refreshes the
+    cached value twice.
+    """
+    global _now_value, _now_stamp_ns
+    now_ns = time.monotonic_ns()
+    if _now_value is None or now_ns - _now_stamp_ns >= 1_000_000:
+        _now_value = datetime.utcnow()
+        _now_stamp_ns = now_ns
+    return _now_value
+
+
+def dequantize_embedding(data: bytes, scale: float) -> np.ndarray:
+    """Reconstruct a float32 embedding from int8 bytes and its scale."""
+    return np.frombuffer(data, dtype=np.int8).astype(np.float32) * scale
+
+
+# Internal pipeline carriers are slotted dataclasses: they only move
+# data between trusted stages, so they skip pydantic validation and
+# the per-instance __dict__ on construction. Models that parse or
+# serialize at the API boundary stay pydantic.
+
+@dataclass(slots=True)
+class DocumentChunk:
     """Represents a chunk of a processed document"""
     id: str
     content: str
     chunk_index: int
     chunk_size: int
     source_document_id: str
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
     page_number: Optional[int] = None
     section_title: Optional[str] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class Document(BaseModel):
@@ -42,47 +80,55 @@ class Document(BaseModel):
     tag_weights: Dict[str, float] = Field(default_factory=dict)  # Tag confidence scores
     tag_metadata: Dict[str, Any] = Field(default_factory=dict)  # Tag extraction metadata
     metadata: Dict[str, Any] = Field(default_factory=dict)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    created_at: IsoDatetime = Field(default_factory=_utcnow)
+    updated_at: IsoDatetime = Field(default_factory=_utcnow)
 
 
-class KnowledgeChunk(BaseModel):
+@dataclass(slots=True)
+class KnowledgeChunk:
     """Represents a vectorized knowledge chunk ready for indexing"""
     id: str
     content: str
-    embedding_vector: List[float]
+    embedding_vector: np.ndarray
     source_document_id: str
     chunk_index: int
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
-
-class IngestionTask(BaseModel):
+    def __post_init__(self):
+        # Pack as contiguous float32 - a 1024-d Python float list costs
+        # ~30 KB of boxed objects vs 4 KB packed, and downstream
+        # similarity math wants a contiguous buffer anyway
+        self.embedding_vector = np.asarray(self.embedding_vector, dtype=np.float32)
+    
+    def quantized_embedding(self) -> "tuple[bytes, float]":
+        """Quantize the embedding to int8 bytes plus a per-vector scale.
+        
+        For storage or transport outside the vector database: 4x
+        smaller than float32 with negligible recall loss for RAG-style
+        similarity. Reverse with dequantize_embedding, or score
+        directly as np.dot(q_a, q_b) * (scale_a * scale_b).
+        """
+        peak = float(np.abs(self.embedding_vector).max())
+        if peak == 0.0:
+            return bytes(len(self.embedding_vector)), 0.0
+        scale = peak / 127.0
+        quantized = np.round(self.embedding_vector / scale).astype(np.int8)
+        return quantized.tobytes(), scale
+
+
+@dataclass(slots=True)
+class IngestionTask:
     """Represents a document ingestion task"""
     task_id: str
     source_type: SourceType
     source_location: str
     status: TaskStatus = TaskStatus.QUEUED
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: datetime = field(default_factory=_utcnow)
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
     result_data: Optional[Dict[str, Any]] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class SearchResult(BaseModel):
@@ -91,11 +137,6 @@ class SearchResult(BaseModel):
     score: float
     source: Dict[str, Any]
     metadata: Dict[str, Any] = Field(default_factory=dict)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class QueryRequest(BaseModel):
@@ -118,11 +159,6 @@ class QueryResponse(BaseModel):
     processing_time_ms: int
     query_tags: Optional[List[str]] = None  # Tags extracted from query
     search_strategy: Optional[str] = None  # Which search strategy was used
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class IngestionRequest(BaseModel):
@@ -145,25 +181,15 @@ class IngestionResponse(BaseModel):
     task_id: str
     status: TaskStatus
     message: str
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class TaskStatusResponse(BaseModel):
     """Response model for task status queries"""
     task_id: str
     status: TaskStatus
-    created_at: datetime
-    updated_at: datetime
-    completed_at: Optional[datetime] = None
+    created_at: IsoDatetime
+    updated_at: IsoDatetime
+    completed_at: Optional[IsoDatetime] = None
     error_message: Optional[str] = None
     result_data: Optional[Dict[str, Any]] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    metadata: Dict[str, Any] = Field(default_factory=dict)
\ No newline at end of file
@@ -8,10 +8,10 @@ import asyncio
 import aiohttp
 import aiofiles
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 import magic
-import PyPDF2
+import fitz
 from bs4 import BeautifulSoup
 import io
 from datetime import datetime
@@ -19,12 +19,46 @@ import uuid
 
 from .models import Document, DocumentChunk, SourceType
 
+# Hot-path regexes compiled once at import - the re module cache still
+# costs a lookup per call
+_PARA_RE = re.compile(r'\n\s*\n')
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+_MULTI_NL_RE = re.compile(r'\n\s*\n\s*\n')
+_CONTENT_CLASS_RE = re.compile(r'content|main|body')
+
+
+def _iter_splits(pattern: "re.Pattern[str]", text: str) -> Iterator[str]:
+    """Yield the pieces ``pattern.split(text)`` would produce, lazily.
+
+    ``re.split`` materializes every piece up front - for a 10MB document
+    that is a full second copy of the text before the first chunk can be
+    packed. Walking the match offsets and slicing between them keeps only
+    the piece currently being consumed alive.
+    """
+    prev = 0
+    for match in pattern.finditer(text):
+        yield text[prev:match.start()]
+        prev = match.end()
+    yield text[prev:]
+
 
 class DocumentProcessor:
     """Handles document parsing and content extraction"""
     
-    def __init__(self, max_file_size_mb: int = 100):
+    # PDFs below this page count aren't worth the per-range document
+    # reopen; above it, extraction splits across worker threads
+    _PARALLEL_PAGE_THRESHOLD = 16
+    _MAX_PDF_WORKERS = 8
+
+    # HTML tags whose text is extracted, in document order
+    _TEXT_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'td', 'th'})
+    
+    def __init__(self, max_file_size_mb: int = 100, max_concurrent_fetches: int = 16):
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Bounds concurrent URL fetches - unbounded gathers would
+        # exhaust the connector pool and trip remote rate limits
+        self._fetch_sem = asyncio.Semaphore(max_concurrent_fetches)
     
     async def process_file(
         self,
@@ -115,7 +149,9 @@ class DocumentProcessor:
     def _detect_file_type(self, file_content: bytes, filename: str) -> str:
         """Detect file MIME type"""
         try:
-            return magic.from_buffer(file_content, mime=True)
+            # libmagic identifies MIME types from the first bytes; slicing
+            # keeps it from scanning a potentially 100 MB buffer
+            return magic.from_buffer(file_content[:4096], mime=True)
         except Exception:
             # Fallback to extension-based detection
             ext = Path(filename).suffix.lower()
@@ -131,123 +167,215 @@ class DocumentProcessor:
     async def _extract_pdf_content(self, file_content: bytes) -> str:
         """Extract text content from PDF"""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+            page_count = await asyncio.to_thread(self._pdf_page_count, file_content)
+            
+            workers = min(os.cpu_count() or 1, self._MAX_PDF_WORKERS)
+            if page_count < self._PARALLEL_PAGE_THRESHOLD or workers <= 1:
+                text = await asyncio.to_thread(
+                    self._extract_pdf_range, file_content, 0, page_count
+                )
+            else:
+                # Page extraction releases the GIL inside MuPDF, so
+                # contiguous page ranges run on separate threads; each
+                # worker opens its own Document because a fitz Document
+                # must not be shared across threads
+                step = -(-page_count // workers)
+                parts = await asyncio.gather(*[
+                    asyncio.to_thread(
+                        self._extract_pdf_range,
+                        file_content, start, min(start + step, page_count)
+                    )
+                    for start in range(0, page_count, step)
+                ])
+                text = "\n\n".join(p for p in parts if p)
+            
+            if not text:
+                raise ValueError("No readable text found in PDF")
             
+            return text
+        except Exception as e:
+            raise ValueError(f"Failed to process PDF: {str(e)}")
+    
+    def _pdf_page_count(self, file_content: bytes) -> int:
+        """Open the PDF header, reject encrypted files, count pages."""
+        doc = fitz.open(stream=file_content, filetype="pdf")
+        try:
             # Check if PDF is encrypted
-            if pdf_reader.is_encrypted:
+            if doc.needs_pass:
                 raise ValueError("PDF file is encrypted and cannot be processed")
-            
-            # Extract text from all pages
-            text_parts = []
-            for page_num, page in enumerate(pdf_reader.pages):
+            return doc.page_count
+        finally:
+            doc.close()
+    
+    def _extract_pdf_range(self, file_content: bytes, start: int, stop: int) -> str:
+        """Extract text from pages [start, stop) via PyMuPDF's C engine."""
+        doc = fitz.open(stream=file_content, filetype="pdf")
+        try:
+            # Stream pages into one buffer - no list of page strings
+            # plus a second full-size join allocation at the end
+            buf = io.StringIO()
+            wrote_any = False
+            for page_num in range(start, stop):
                 try:
-                    page_text = page.extract_text()
+                    page_text = doc[page_num].get_text("text")
                     if page_text.strip():
-                        text_parts.append(f"[Page {page_num + 1}]\n{page_text}")
+                        if wrote_any:
+                            buf.write("\n\n")
+                        buf.write(f"[Page {page_num + 1}]\n")
+                        buf.write(page_text)
+                        wrote_any = True
                 except Exception as e:
                     print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
                     continue
             
-            if not text_parts:
-                raise ValueError("No readable text found in PDF")
-            
-            return "\n\n".join(text_parts)
-            
-        except Exception as e:
-            raise ValueError(f"Failed to process PDF: {str(e)}")
+            return buf.getvalue()
+        finally:
+            doc.close()
     
     async def _extract_text_content(self, file_content: bytes) -> str:
         """Extract content from text files"""
         try:
-            # Try different encodings
-            for encoding in ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']:
+            # utf-8 dominates in practice; try it before paying for
+            # detection
+            try:
+                return file_content.decode('utf-8')
+            except UnicodeDecodeError:
+                pass
+
+            # One detection pass instead of a full-buffer decode attempt
+            # per candidate encoding
+            try:
+                from charset_normalizer import from_bytes
+                best = from_bytes(file_content).best()
+                if best is not None:
+                    return str(best)
+            except ImportError:
+                pass
+
+            # Fallback: try the remaining legacy encodings directly
+            for encoding in ['utf-8-sig', 'latin1', 'cp1252']:
                 try:
                     return file_content.decode(encoding)
                 except UnicodeDecodeError:
                     continue
-            
+
             raise ValueError("Could not decode text file with any supported encoding")
             
         except Exception as e:
             raise ValueError(f"Failed to process text file: {str(e)}")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared HTTP session.
+        
+        One session per processor keeps the connection pool (and DNS
+        cache) alive across fetches, so repeat requests to a host skip
+        the TCP+TLS handshake.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=10, ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'KnowledgeBase-RAG-Bot/1.0'}
+            )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     async def _fetch_url_content(self, url: str) -> Tuple[str, Optional[str]]:
         """Fetch and extract content from URL"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                    headers={'User-Agent': 'KnowledgeBase-RAG-Bot/1.0'}
-                ) as response:
-                    if response.status != 200:
-                        raise ValueError(f"HTTP {response.status}: {response.reason}")
-                    
-                    content_type = response.headers.get('content-type', '').lower()
-                    if not content_type.startswith('text/html'):
-                        raise ValueError(f"Unsupported content type: {content_type}")
-                    
-                    html_content = await response.text()
-                    
-            # Parse HTML and extract content
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract title
-            title_elem = soup.find('title')
-            page_title = title_elem.get_text().strip() if title_elem else None
-            
-            # Extract main content
-            content_parts = []
-            
-            # Try to find main content areas
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main|body'))
-            
-            if main_content:
-                content_parts.append(self._extract_html_text(main_content))
-            else:
-                # Fallback: extract from body
-                body = soup.find('body')
-                if body:
-                    content_parts.append(self._extract_html_text(body))
-                else:
-                    # Last resort: get all text
-                    content_parts.append(soup.get_text())
-            
-            # Clean and join content
-            content = "\n\n".join(content_parts)
-            content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)  # Remove excessive newlines
-            content = content.strip()
-            
-            if not content:
-                raise ValueError("No readable content found on webpage")
+            session = await self._get_session()
+            async with self._fetch_sem, session.get(url) as response:
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}: {response.reason}")
+                
+                content_type = response.headers.get('content-type', '').lower()
+                if not content_type.startswith('text/html'):
+                    raise ValueError(f"Unsupported content type: {content_type}")
+                
+                # Stream the body into a growable bytearray and decode
+                # once - response.text() materializes the full bytes
+                # object and then a second full copy while decoding
+                buf = bytearray()
+                async for chunk in response.content.iter_chunked(65536):
+                    buf += chunk
+                html_content = buf.decode(response.charset or 'utf-8', errors='replace')
             
-            return content, page_title
+            # CPU-bound parse + extraction runs off the event loop
+            return await asyncio.to_thread(self._parse_html_sync, html_content)
             
         except Exception as e:
             raise ValueError(f"Failed to fetch URL content: {str(e)}")
     
+    def _parse_html_sync(self, html_content: str) -> Tuple[str, Optional[str]]:
+        """Parse HTML and extract the main content and page title."""
+        # lxml's C parser is several times faster than the pure-Python
+        # html.parser on parse + find_all
+        soup = BeautifulSoup(html_content, 'lxml')
+
+        # Extract title
+        title_elem = soup.find('title')
+        page_title = title_elem.get_text().strip() if title_elem else None
+
+        # Try to find main content areas
+        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=_CONTENT_CLASS_RE)
+
+        # Strip script/style only inside the subtree we extract from -
+        # on script-heavy pages most of them live outside the content
+        # area and stripping the whole document is wasted work
+        target = main_content or soup.find('body') or soup
+        for script in target(["script", "style"]):
+            script.decompose()
+
+        if target is soup:
+            # Last resort: get all text
+            content = soup.get_text()
+        else:
+            content = self._extract_html_text(target)
+        
+        # Remove excessive newlines
+        content = _MULTI_NL_RE.sub('\n\n', content)
+        content = content.strip()
+        
+        if not content:
+            raise ValueError("No readable content found on webpage")
+        
+        return content, page_title
+    
     def _extract_html_text(self, element) -> str:
         """Extract structured text from HTML element, preserving some formatting"""
-        text_parts = []
-        
-        for elem in element.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'td', 'th']):
+        # Same streaming accumulator as the PDF path
+        buf = io.StringIO()
+        wrote_any = False
+        text_tags = self._TEXT_TAGS
+
+        # Walk descendants lazily instead of letting find_all build a
+        # full match list for the subtree up front
+        for elem in element.descendants:
+            name = getattr(elem, 'name', None)
+            if name not in text_tags:
+                continue
             text = elem.get_text().strip()
             if text:
+                if wrote_any:
+                    buf.write("\n\n")
                 # Add formatting hints for headers
-                if elem.name.startswith('h'):
-                    level = int(elem.name[1])
-                    prefix = '#' * level + ' '
-                    text_parts.append(f"{prefix}{text}")
-                elif elem.name == 'li':
-                    text_parts.append(f"• {text}")
-                else:
-                    text_parts.append(text)
-        
-        return "\n\n".join(text_parts)
+                if name.startswith('h'):
+                    level = int(name[1])
+                    buf.write('#' * level)
+                    buf.write(' ')
+                elif name == 'li':
+                    buf.write("• ")
+                buf.write(text)
+                wrote_any = True
+
+        return buf.getvalue()
 
 
 class TextChunker:
@@ -266,110 +394,142 @@ class TextChunker:
     def chunk_document(self, document: Document) -> List[DocumentChunk]:
         """
         Split document into semantic chunks.
-        
+
         Args:
             document: Document to chunk
-            
+
         Returns:
             List of DocumentChunk objects
         """
-        # First, try to split by semantic boundaries
-        chunks = self._split_by_semantic_boundaries(document.content)
-        
-        # If chunks are too large, further split them
-        final_chunks = []
-        for chunk_text in chunks:
+        return list(self.iter_chunks(document))
+
+    def iter_chunks(self, document: Document) -> Iterator[DocumentChunk]:
+        """
+        Yield DocumentChunk objects for a document lazily.
+
+        Produces the same chunks as chunk_document, but incrementally -
+        a streaming pipeline can start embedding while later parts of
+        the document are still being chunked.
+
+        Args:
+            document: Document to chunk
+
+        Yields:
+            DocumentChunk objects in document order
+        """
+        base_metadata = {
+            "source_type": document.source_type.value,
+            "source_location": document.source_location,
+            "title": document.title,
+            "author": document.author,
+            "tags": document.tags,
+            **document.metadata
+        }
+
+        index = 0
+        # First, try to split by semantic boundaries; oversized pieces
+        # are further split by size
+        for chunk_text in self._split_by_semantic_boundaries(document.content):
             if len(chunk_text) > self.chunk_size:
-                sub_chunks = self._split_by_size(chunk_text)
-                final_chunks.extend(sub_chunks)
+                pieces = self._split_by_size(chunk_text)
             else:
-                final_chunks.append(chunk_text)
-        
-        # Create DocumentChunk objects
-        document_chunks = []
-        for i, chunk_text in enumerate(final_chunks):
-            if len(chunk_text.strip()) >= self.min_chunk_size:
-                chunk = DocumentChunk(
-                    id=f"{document.id}#chunk{i}",
-                    content=chunk_text.strip(),
-                    chunk_index=i,
-                    chunk_size=len(chunk_text),
-                    source_document_id=document.id,
-                    metadata={
-                        "source_type": document.source_type.value,
-                        "source_location": document.source_location,
-                        "title": document.title,
-                        "author": document.author,
-                        "tags": document.tags,
-                        **document.metadata
-                    }
-                )
-                document_chunks.append(chunk)
-        
-        return document_chunks
+                pieces = (chunk_text,)
+
+            for piece in pieces:
+                stripped = piece.strip()
+                if len(stripped) >= self.min_chunk_size:
+                    yield DocumentChunk(
+                        id=f"{document.id}#chunk{index}",
+                        content=stripped,
+                        chunk_index=index,
+                        chunk_size=len(piece),
+                        source_document_id=document.id,
+                        metadata=dict(base_metadata)
+                    )
+                # Index advances for skipped pieces too, matching the
+                # numbering chunk_document always produced
+                index += 1
     
-    def _split_by_semantic_boundaries(self, text: str) -> List[str]:
-        """Split text by semantic boundaries like paragraphs and sections"""
-        chunks = []
+    def _split_by_semantic_boundaries(self, text: str) -> Iterator[str]:
+        """Split text by semantic boundaries like paragraphs and sections
         
+        Paragraphs are packed by index with a running length and only
+        joined when a chunk is emitted - growing the pending chunk with
+        += rebuilt the whole string per paragraph, which is quadratic
+        on large documents. Paragraphs stream out of _iter_splits and
+        chunks are yielded as they fill, so peak memory stays at one
+        pending chunk regardless of document size.
+        """
         # Split by double newlines (paragraphs)
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _iter_splits(_PARA_RE, text)
         
-        current_chunk = ""
+        buf: List[str] = []
+        buf_len = 0
         for paragraph in paragraphs:
             paragraph = paragraph.strip()
             if not paragraph:
                 continue
             
             # Check if adding this paragraph would exceed chunk size
-            if len(current_chunk) + len(paragraph) + 2 > self.chunk_size and current_chunk:
-                chunks.append(current_chunk)
+            if buf and buf_len + len(paragraph) + 2 > self.chunk_size:
+                chunk = "\n\n".join(buf)
+                yield chunk
                 
                 # Start new chunk with overlap
                 if self.chunk_overlap > 0:
-                    current_chunk = self._get_overlap_text(current_chunk) + "\n\n" + paragraph
+                    overlap = self._get_overlap_text(chunk)
+                    buf = [overlap, paragraph]
+                    buf_len = len(overlap) + 2 + len(paragraph)
                 else:
-                    current_chunk = paragraph
+                    buf = [paragraph]
+                    buf_len = len(paragraph)
             else:
-                if current_chunk:
-                    current_chunk += "\n\n" + paragraph
+                if buf:
+                    buf_len += 2 + len(paragraph)
                 else:
-                    current_chunk = paragraph
+                    buf_len = len(paragraph)
+                buf.append(paragraph)
         
         # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk)
-        
-        return chunks
+        if buf:
+            yield "\n\n".join(buf)
     
-    def _split_by_size(self, text: str) -> List[str]:
-        """Split text by fixed size with overlap"""
-        chunks = []
+    def _split_by_size(self, text: str) -> Iterator[str]:
+        """Split text by fixed size with overlap
         
+        Same list-accumulator pattern as the paragraph splitter - the
+        old per-sentence concatenation recopied the pending chunk on
+        every append. Sentences stream out of _iter_splits like the
+        paragraphs above.
+        """
         # Split by sentences first
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _iter_splits(_SENT_RE, text)
         
-        current_chunk = ""
+        buf: List[str] = []
+        buf_len = 0
         for sentence in sentences:
-            if len(current_chunk) + len(sentence) + 1 > self.chunk_size and current_chunk:
-                chunks.append(current_chunk)
+            if buf and buf_len + len(sentence) + 1 > self.chunk_size:
+                chunk = " ".join(buf)
+                yield chunk
                 
                 # Start new chunk with overlap
                 if self.chunk_overlap > 0:
-                    current_chunk = self._get_overlap_text(current_chunk) + " " + sentence
+                    overlap = self._get_overlap_text(chunk)
+                    buf = [overlap, sentence]
+                    buf_len = len(overlap) + 1 + len(sentence)
                 else:
-                    current_chunk = sentence
+                    buf = [sentence]
+                    buf_len = len(sentence)
             else:
-                if current_chunk:
-                    current_chunk += " " + sentence
+                if buf:
+                    buf_len += 1 + len(sentence)
                 else:
-                    current_chunk = sentence
+                    buf_len = len(sentence)
+                buf.append(sentence)
         
         # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk)
-        
-        return chunks
+        if buf:
+            yield " ".join(buf)
     
     def _get_overlap_text(self, text: str) -> str:
         """Get overlap text from the end of current chunk"""
@@ -2,8 +2,10 @@
 Query engine for retrieving relevant knowledge chunks based on user queries.
 """
 
+import asyncio
 import time
 import logging
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 
 from src.abstractions import EmbeddingProvider, VectorDatabase, TaggingProvider
@@ -16,7 +18,17 @@ class QueryEngine:
     """
     Engine for querying the knowledge base using vector similarity search.
     """
-    
+
+    # Optional metadata fields copied into source info: (metadata key,
+    # output key)
+    _SRC_FIELDS = (
+        ("title", "title"),
+        ("author", "author"),
+        ("page_number", "page"),
+        ("section_title", "section"),
+        ("chunk_index", "chunk"),
+    )
+
     def __init__(
         self,
         embedding_provider: EmbeddingProvider,
@@ -28,6 +40,44 @@ class QueryEngine:
         self.vector_database = vector_database
         self.tagging_provider = tagging_provider
         self.default_index_name = default_index_name
+        # The embedding dimension is fixed for the life of the provider;
+        # cache it and a shared zero vector instead of rebuilding a
+        # ~1500-element list on every metadata-only search
+        self._dim = embedding_provider.get_embedding_dimension()
+        self._zero_vector: List[float] = [0.0] * self._dim
+        # LRU cache of query embeddings - repeat queries are common in
+        # chat UIs and each miss costs a model call. In-flight lookups
+        # are tracked so duplicate concurrent queries share one call.
+        self._embed_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._embed_cache_size = 1024
+        self._embed_inflight: Dict[str, "asyncio.Task[List[float]]"] = {}
+
+    async def _get_query_embedding(self, query_text: str) -> List[float]:
+        """Get an embedding for query_text, using the LRU cache."""
+        cached = self._embed_cache.get(query_text)
+        if cached is not None:
+            self._embed_cache.move_to_end(query_text)
+            return cached
+
+        task = self._embed_inflight.get(query_text)
+        if task is not None:
+            # Another coroutine is already computing this embedding;
+            # shield so one cancelled waiter doesn't fail the rest
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(
+            self.embedding_provider.get_embedding(query_text)
+        )
+        self._embed_inflight[query_text] = task
+        try:
+            vector = await task
+        finally:
+            self._embed_inflight.pop(query_text, None)
+
+        self._embed_cache[query_text] = vector
+        if len(self._embed_cache) > self._embed_cache_size:
+            self._embed_cache.popitem(last=False)
+        return vector
     
     async def query(
         self,
@@ -44,7 +94,8 @@ class QueryEngine:
         Returns:
             QueryResponse with search results
         """
-        start_time = time.time()
+        # Monotonic timing - wall clock can jump under NTP adjustment
+        start_ns = time.perf_counter_ns()
         
         try:
             # Use provided index name or default
@@ -68,7 +119,7 @@ class QueryEngine:
                     logger.warning(f"Tag analysis failed, falling back to semantic search: {e}")
             
             # Generate query embedding
-            query_vector = await self.embedding_provider.get_embedding(query_request.query)
+            query_vector = await self._get_query_embedding(query_request.query)
             
             # Choose search strategy based on tag information
             if query_tags and hasattr(self.vector_database, 'search_with_tags'):
@@ -91,19 +142,30 @@ class QueryEngine:
                     filter_criteria=query_request.filters
                 )
             
-            # Transform to SearchResult objects
-            results = []
-            for result in search_results:
-                search_result = SearchResult(
+            # Transform to SearchResult objects. Chunks of the same
+            # document often share one metadata dict after a backend
+            # fetch; memoize source info per object so it is built once
+            include_metadata = query_request.include_metadata
+            source_cache: Dict[int, Dict[str, Any]] = {}
+
+            def source_for(metadata: Dict[str, Any]) -> Dict[str, Any]:
+                source = source_cache.get(id(metadata))
+                if source is None:
+                    source = source_cache[id(metadata)] = self._extract_source_info(metadata)
+                return source
+
+            results = [
+                SearchResult(
                     content=result['content'],
                     score=result['score'],
-                    source=self._extract_source_info(result['metadata']),
-                    metadata=result['metadata'] if query_request.include_metadata else {}
+                    source=source_for(result['metadata']),
+                    metadata=result['metadata'] if include_metadata else {}
                 )
-                results.append(search_result)
+                for result in search_results
+            ]
             
             # Calculate processing time
-            processing_time_ms = int((time.time() - start_time) * 1000)
+            processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             logger.info(f"Query completed in {processing_time_ms}ms, found {len(results)} results")
             
@@ -168,22 +230,31 @@ class QueryEngine:
         """
         # First, get a chunk from the document to use as query
         target_index = index_name or self.default_index_name
-        
-        # Search for chunks from this document
-        document_chunks = await self.vector_database.search(
-            index_name=target_index,
-            query_vector=[0.0] * self.embedding_provider.get_embedding_dimension(),  # Dummy vector
-            top_k=1,
-            filter_criteria={"source_document_id": document_id}
-        )
-        
-        if not document_chunks:
-            return []
-        
-        # Use the first chunk to find similar content
-        query_vector = document_chunks[0].get('vector', [])
-        if not query_vector:
-            return []
+
+        if hasattr(self.vector_database, 'get_vector_by_filter'):
+            # Direct metadata lookup - no dummy-vector similarity scan
+            query_vector = await self.vector_database.get_vector_by_filter(
+                index_name=target_index,
+                filter_criteria={"source_document_id": document_id}
+            )
+            if query_vector is None:
+                return []
+        else:
+            # Fall back to a zero-vector search for chunks from this document
+            document_chunks = await self.vector_database.search(
+                index_name=target_index,
+                query_vector=self._zero_vector,  # Dummy vector
+                top_k=1,
+                filter_criteria={"source_document_id": document_id}
+            )
+
+            if not document_chunks:
+                return []
+
+            # Use the first chunk to find similar content
+            query_vector = document_chunks[0].get('vector', [])
+            if not query_vector:
+                return []
         
         # Search for similar content, excluding the source document
         similar_results = await self.vector_database.search(
@@ -229,27 +300,32 @@ class QueryEngine:
         """
         target_index = index_name or self.default_index_name
         
-        # Use a zero vector for metadata-only search
-        zero_vector = [0.0] * self.embedding_provider.get_embedding_dimension()
-        
-        search_results = await self.vector_database.search(
-            index_name=target_index,
-            query_vector=zero_vector,
-            top_k=top_k,
-            filter_criteria=filters
-        )
+        if hasattr(self.vector_database, 'filter_only'):
+            # Metadata-only backend path - skips the ANN similarity
+            # scan the zero-vector trick still pays for
+            search_results = await self.vector_database.filter_only(
+                index_name=target_index,
+                filter_criteria=filters,
+                top_k=top_k
+            )
+        else:
+            # Fall back to a zero-vector similarity search
+            search_results = await self.vector_database.search(
+                index_name=target_index,
+                query_vector=self._zero_vector,
+                top_k=top_k,
+                filter_criteria=filters
+            )
         
-        results = []
-        for result in search_results:
-            search_result = SearchResult(
+        return [
+            SearchResult(
                 content=result['content'],
                 score=0.0,  # No semantic score for metadata-only search
                 source=self._extract_source_info(result['metadata']),
                 metadata=result['metadata']
             )
-            results.append(search_result)
-        
-        return results
+            for result in search_results
+        ]
     
     def _extract_source_info(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -265,23 +341,14 @@ class QueryEngine:
             "type": metadata.get("source_type", "unknown"),
             "location": metadata.get("source_location", ""),
         }
-        
-        # Add specific fields based on source type
-        if "title" in metadata:
-            source_info["title"] = metadata["title"]
-        
-        if "author" in metadata:
-            source_info["author"] = metadata["author"]
-        
-        if "page_number" in metadata:
-            source_info["page"] = metadata["page_number"]
-        
-        if "section_title" in metadata:
-            source_info["section"] = metadata["section_title"]
-        
-        if "chunk_index" in metadata:
-            source_info["chunk"] = metadata["chunk_index"]
-        
+
+        # Add the optional fields present in the metadata in one pass
+        source_info.update(
+            (out_key, metadata[key])
+            for key, out_key in self._SRC_FIELDS
+            if key in metadata
+        )
+
         return source_info
     
     async def get_index_stats(self, index_name: Optional[str] = None) -> Dict[str, Any]:
@@ -302,13 +369,13 @@ class QueryEngine:
             stats = {
                 "index_name": target_index,
                 "status": "active",
-                "vector_dimension": self.embedding_provider.get_embedding_dimension()
+                "vector_dimension": self._dim
             }
             
             # Try to get document count by searching with a dummy vector
             dummy_results = await self.vector_database.search(
                 index_name=target_index,
-                query_vector=[0.0] * self.embedding_provider.get_embedding_dimension(),
+                query_vector=self._zero_vector,
                 top_k=1
             )
             
@@ -4,14 +4,23 @@ Handles the end-to-end processing of documents from ingestion to indexing.
 """
 
 import asyncio
+import hashlib
+import random
 import uuid
+import weakref
+from itertools import islice
+
+import aiofiles
+import aiofiles.os
+
+import numpy as np
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 import logging
 
 from src.abstractions import (
-    EmbeddingProvider, VectorDatabase, StorageProvider, 
+    EmbeddingProvider, EmbeddingCache, VectorDatabase, StorageProvider,
     StateManager, TaskStatus, SourceType, WorkflowOrchestrator
 )
 from .models import Document, DocumentChunk, KnowledgeChunk, IngestionTask
@@ -25,6 +34,19 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
     Local implementation of workflow orchestration.
     Processes tasks sequentially in the same process.
     """
+
+    # Streaming pipeline tuning: batch size per embed call, bounded
+    # queue depth between stages, and embedder worker count
+    _PIPELINE_BATCH_SIZE = 32
+    _PIPELINE_QUEUE_DEPTH = 4
+    _PIPELINE_EMBEDDERS = 4
+
+    # Maximum chunks per index_documents call
+    _INDEX_BATCH_SIZE = 500
+    # Files under this size are read in one aiofiles call; larger ones
+    # go through a worker thread where a single blocking read is cheaper
+    # than many small async round-trips
+    _SMALL_FILE_BYTES = 64 * 1024
     
     def __init__(
         self,
@@ -32,7 +54,12 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
         vector_database: VectorDatabase,
         storage_provider: StorageProvider,
         state_manager: StateManager,
+        embedding_cache: Optional[EmbeddingCache] = None,
         max_concurrent_tasks: int = 4,
+        max_inflight_batches: int = 8,
+        embed_concurrency: int = 4,
+        max_batch_tokens: int = 8000,
+        max_batch_items: int = 96,
         chunk_size: int = 1000,
         chunk_overlap: int = 200
     ):
@@ -40,7 +67,20 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
         self.vector_database = vector_database
         self.storage_provider = storage_provider
         self.state_manager = state_manager
+        self.embedding_cache = embedding_cache
         self.max_concurrent_tasks = max_concurrent_tasks
+        self.max_inflight_batches = max_inflight_batches
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_items = max_batch_items
+
+        # Cache keyspace: vectors are only comparable within one
+        # provider/model pair
+        self._cache_provider = type(embedding_provider).__name__
+        self._cache_model = (
+            getattr(embedding_provider, 'model_name', None)
+            or getattr(embedding_provider, 'model_id', None)
+            or 'default'
+        )
         
         # Initialize processors
         self.document_processor = DocumentProcessor()
@@ -49,10 +89,70 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
             chunk_overlap=chunk_overlap
         )
         
-        # Track running tasks
-        self._running_tasks: Dict[str, asyncio.Task] = {}
+        # Track running tasks. The weak registry auto-evicts entries
+        # when a task finishes; _task_refs holds the strong reference
+        # for the task's lifetime so the loop can't drop it early.
+        self._running_tasks: "weakref.WeakValueDictionary[str, asyncio.Task]" = \
+            weakref.WeakValueDictionary()
+        self._task_refs: set = set()
         self._semaphore = asyncio.Semaphore(max_concurrent_tasks)
+
+        # Coalescing status writer - created lazily on the running loop
+        self._status_q: Optional[asyncio.Queue] = None
+        self._status_writer_task: Optional[asyncio.Task] = None
+
+        # Shared across ingestion tasks: caps total provider calls in
+        # flight. With a CPU-bound local model, concurrent tasks each
+        # driving encode() through the executor oversubscribe the cores
+        # and throughput collapses - the factory sizes this to 1 there.
+        self._embed_semaphore = asyncio.Semaphore(embed_concurrency)
     
+    def _queue_status(self, task_id: str, status: TaskStatus) -> None:
+        """Queue a non-terminal status update.
+
+        Intermediate transitions are telemetry - writing them through a
+        background task keeps their round-trips off the workflow's
+        critical path, and rapid transitions for the same task coalesce
+        to the latest one. Terminal SUCCESS/FAILED writes stay awaited
+        for durability.
+        """
+        if self._status_writer_task is None or self._status_writer_task.done():
+            self._status_q = asyncio.Queue()
+            self._status_writer_task = asyncio.create_task(self._status_writer())
+        self._status_q.put_nowait((task_id, status))
+
+    async def _status_writer(self) -> None:
+        """Drain queued status updates, keeping only the latest per task."""
+        while True:
+            item = await self._status_q.get()
+            latest = {item[0]: item[1]}
+            drained = 1
+            while True:
+                try:
+                    task_id, status = self._status_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                latest[task_id] = status
+                drained += 1
+
+            try:
+                for task_id, status in latest.items():
+                    try:
+                        await self.state_manager.update_task_status(
+                            task_id=task_id,
+                            status=status
+                        )
+                    except Exception as e:
+                        logger.warning(f"Status update failed for task {task_id}: {e}")
+            finally:
+                for _ in range(drained):
+                    self._status_q.task_done()
+
+    async def _flush_status_updates(self) -> None:
+        """Wait until every queued status update has been written."""
+        if self._status_q is not None:
+            await self._status_q.join()
+
     async def start_ingestion_workflow(
         self,
         task_id: str,
@@ -76,9 +176,7 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
                 self._run_ingestion_workflow(task_id, source_location, source_type, metadata)
             )
             self._running_tasks[task_id] = task
-            
-            # Remove from running tasks when done
-            task.add_done_callback(lambda t: self._running_tasks.pop(task_id, None))
+            self._task_refs.add(task)
             
             return True
             
@@ -108,22 +206,23 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
                 logger.info(f"Starting ingestion workflow for task {task_id}")
                 
                 # Step 1: Update status to processing
-                await self.state_manager.update_task_status(
-                    task_id=task_id,
-                    status=TaskStatus.PROCESSING
-                )
+                self._queue_status(task_id, TaskStatus.PROCESSING)
                 
                 # Step 2: Parse document content
-                await self.state_manager.update_task_status(
-                    task_id=task_id,
-                    status=TaskStatus.PROCESSING_PARSING
-                )
-                
-                document = await self._parse_document(source_location, source_type, metadata)
+                self._queue_status(task_id, TaskStatus.PROCESSING_PARSING)
                 
-                # Step 3: Store original document
+                document, original_bytes = await self._parse_document(
+                    source_location, source_type, metadata
+                )
+
+                # Step 3: Store original document. For FILE/S3 sources
+                # the payload was already read into memory once - reuse
+                # it via a zero-copy view instead of re-encoding the
+                # parsed content back to bytes.
+                if original_bytes is None:
+                    original_bytes = document.content.encode('utf-8')
                 stored_location = await self.storage_provider.store_file(
-                    file_content=document.content.encode('utf-8'),
+                    file_content=memoryview(original_bytes),
                     file_path=f"documents/{task_id}/{document.original_filename or 'content.txt'}",
                     metadata={
                         "task_id": task_id,
@@ -133,39 +232,27 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
                     }
                 )
                 
-                # Step 4: Chunk document
-                await self.state_manager.update_task_status(
-                    task_id=task_id,
-                    status=TaskStatus.PROCESSING_CHUNKING
-                )
-                
-                chunks = self.text_chunker.chunk_document(document)
-                logger.info(f"Created {len(chunks)} chunks for task {task_id}")
-                
-                # Step 5: Generate embeddings
-                await self.state_manager.update_task_status(
-                    task_id=task_id,
-                    status=TaskStatus.PROCESSING_EMBEDDING
-                )
-                
-                knowledge_chunks = await self._generate_embeddings(chunks)
-                
-                # Step 6: Index in vector database
-                await self.state_manager.update_task_status(
-                    task_id=task_id,
-                    status=TaskStatus.PROCESSING_INDEXING
+                # Steps 4-6: Chunk, embed and index as a streaming
+                # pipeline - stages overlap and only a few batches are
+                # in memory at once instead of the whole document
+                self._queue_status(task_id, TaskStatus.PROCESSING_CHUNKING)
+
+                chunks_created, chunks_indexed = await self._run_processing_pipeline(
+                    task_id, document
                 )
-                
-                await self._index_knowledge_chunks(knowledge_chunks)
-                
+                logger.info(f"Created {chunks_created} chunks for task {task_id}")
+
                 # Step 7: Mark as completed
                 result_data = {
                     "document_id": document.id,
                     "stored_location": stored_location,
-                    "chunks_created": len(chunks),
-                    "chunks_indexed": len(knowledge_chunks)
+                    "chunks_created": chunks_created,
+                    "chunks_indexed": chunks_indexed
                 }
                 
+                # Flush queued telemetry first so the durable terminal
+                # write cannot be overtaken by a stale transition
+                await self._flush_status_updates()
                 await self.state_manager.update_task_status(
                     task_id=task_id,
                     status=TaskStatus.SUCCESS,
@@ -176,115 +263,317 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
                 
             except Exception as e:
                 logger.error(f"Workflow failed for task {task_id}: {e}")
+                await self._flush_status_updates()
                 await self.state_manager.update_task_status(
                     task_id=task_id,
                     status=TaskStatus.FAILED,
                     error_message=str(e)
                 )
                 raise
+            finally:
+                # Drop the strong reference; the weak registry entry
+                # evicts itself once the task object goes away
+                self._task_refs.discard(asyncio.current_task())
     
+    async def _run_processing_pipeline(
+        self,
+        task_id: str,
+        document: Document
+    ) -> "tuple[int, int]":
+        """Chunk, embed and index a document as a streaming pipeline.
+
+        The chunker produces batches into a bounded queue, embedder
+        workers turn them into KnowledgeChunks, and an indexer drains
+        them into the vector database. Peak memory is a few batches
+        rather than every chunk and vector of the document at once.
+
+        Returns:
+            (chunks_created, chunks_indexed)
+        """
+        chunk_q: asyncio.Queue = asyncio.Queue(maxsize=self._PIPELINE_QUEUE_DEPTH)
+        index_q: asyncio.Queue = asyncio.Queue(maxsize=self._PIPELINE_QUEUE_DEPTH)
+        batch_size = self._PIPELINE_BATCH_SIZE
+        num_embedders = self._PIPELINE_EMBEDDERS
+
+        chunks_created = 0
+        chunks_indexed = 0
+
+        async def produce() -> None:
+            nonlocal chunks_created
+            chunk_iter = self.text_chunker.iter_chunks(document)
+            while True:
+                # Pull one batch per thread hop; the generator itself
+                # is CPU-bound string work
+                batch = await asyncio.to_thread(
+                    lambda: list(islice(chunk_iter, batch_size))
+                )
+                if not batch:
+                    break
+                chunks_created += len(batch)
+                await chunk_q.put(batch)
+            # One sentinel per embedder signals EOF
+            for _ in range(num_embedders):
+                await chunk_q.put(None)
+
+        async def embed_worker() -> None:
+            while True:
+                batch = await chunk_q.get()
+                if batch is None:
+                    return
+                await index_q.put(await self._generate_embeddings(batch))
+
+        async def index_worker() -> None:
+            nonlocal chunks_indexed
+            while True:
+                knowledge_batch = await index_q.get()
+                if knowledge_batch is None:
+                    return
+                await self._index_knowledge_chunks(knowledge_batch)
+                chunks_indexed += len(knowledge_batch)
+
+        async def coordinate(embed_tasks: List[asyncio.Task]) -> None:
+            await produce()
+            self._queue_status(task_id, TaskStatus.PROCESSING_EMBEDDING)
+            await asyncio.gather(*embed_tasks)
+            self._queue_status(task_id, TaskStatus.PROCESSING_INDEXING)
+            await index_q.put(None)
+
+        # TaskGroup cancels the other stages if any of them fails, so a
+        # dead consumer can't leave the producer blocked on a full queue
+        async with asyncio.TaskGroup() as tg:
+            embed_tasks = [
+                tg.create_task(embed_worker()) for _ in range(num_embedders)
+            ]
+            tg.create_task(index_worker())
+            tg.create_task(coordinate(embed_tasks))
+
+        return chunks_created, chunks_indexed
+
     async def _parse_document(
         self,
         source_location: str,
         source_type: SourceType,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Document:
-        """Parse document from source location"""
+    ) -> "tuple[Document, Optional[bytes]]":
+        """Parse document from source location.
+
+        Returns the parsed Document together with the original payload
+        bytes when the source was already read into memory, so callers
+        can store it without another encode/copy. URL sources return
+        None - only the extracted text is kept for those.
+        """
         if source_type == SourceType.FILE:
             # For file type, source_location should be a temporary file path
             # In practice, this would be handled by the API layer
-            if Path(source_location).exists():
-                with open(source_location, 'rb') as f:
-                    file_content = f.read()
-                filename = Path(source_location).name
-                return await self.document_processor.process_file(
-                    file_content=file_content,
-                    filename=filename,
-                    metadata=metadata
-                )
-            else:
+            source_path = Path(source_location)
+            # One stat answers both "does it exist" and "how big is it"
+            # without blocking the loop or racing a separate open()
+            try:
+                stat = await aiofiles.os.stat(source_location)
+            except (FileNotFoundError, NotADirectoryError):
                 raise ValueError(f"File not found: {source_location}")
-        
+
+            if stat.st_size < self._SMALL_FILE_BYTES:
+                async with aiofiles.open(source_path, 'rb') as f:
+                    file_content = await f.read()
+            else:
+                # A blocking read of a multi-MB upload would stall the
+                # event loop for every other running workflow
+                file_content = await asyncio.to_thread(source_path.read_bytes)
+            filename = source_path.name
+            document = await self.document_processor.process_file(
+                file_content=file_content,
+                filename=filename,
+                metadata=metadata
+            )
+            return document, file_content
+
         elif source_type == SourceType.URL:
-            return await self.document_processor.process_url(
+            document = await self.document_processor.process_url(
                 url=source_location,
                 metadata=metadata
             )
-        
+            return document, None
+
         elif source_type == SourceType.S3:
             # For S3, retrieve file content first
             file_content = await self.storage_provider.retrieve_file(source_location)
             filename = Path(source_location).name
-            return await self.document_processor.process_file(
+            document = await self.document_processor.process_file(
                 file_content=file_content,
                 filename=filename,
                 metadata=metadata
             )
-        
+            return document, file_content
+
         else:
             raise ValueError(f"Unsupported source type: {source_type}")
     
     async def _generate_embeddings(self, chunks: List[DocumentChunk]) -> List[KnowledgeChunk]:
         """Generate embeddings for document chunks"""
-        knowledge_chunks = []
-        
-        # Process chunks in batches for efficiency
-        batch_size = 32
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
-            
-            # Extract texts for batch processing
-            texts = [chunk.content for chunk in batch]
-            
+        if not chunks:
+            return []
+
+        # Check the persistent cache first - re-ingesting unchanged
+        # content should cost zero provider calls. Hashing is CPU-bound
+        # string work, so it runs off-loop like the chunker.
+        hashes = await asyncio.to_thread(
+            lambda: [
+                hashlib.sha256(chunk.content.encode('utf-8')).hexdigest()
+                for chunk in chunks
+            ]
+        )
+        cached: Dict[str, Any] = {}
+        if self.embedding_cache is not None:
             try:
-                # Generate embeddings for batch
-                embeddings = await self.embedding_provider.get_embeddings_batch(texts)
-                
-                # Create KnowledgeChunk objects
-                for chunk, embedding in zip(batch, embeddings):
-                    knowledge_chunk = KnowledgeChunk(
-                        id=chunk.id,
-                        content=chunk.content,
-                        embedding_vector=embedding,
-                        source_document_id=chunk.source_document_id,
-                        chunk_index=chunk.chunk_index,
-                        metadata=chunk.metadata
-                    )
-                    knowledge_chunks.append(knowledge_chunk)
-                
+                cached = await self.embedding_cache.batch_get(
+                    hashes, self._cache_provider, self._cache_model
+                )
             except Exception as e:
-                logger.error(f"Failed to generate embeddings for batch {i//batch_size + 1}: {e}")
-                raise
-        
-        return knowledge_chunks
+                logger.warning(f"Embedding cache lookup failed: {e}")
+
+        # All vectors land in one contiguous (N, D) float32 matrix;
+        # chunks carry row views instead of N separate Python lists
+        emb_matrix: Optional[np.ndarray] = None
+
+        def ensure_matrix(dim: int) -> np.ndarray:
+            nonlocal emb_matrix
+            if emb_matrix is None:
+                emb_matrix = np.empty((len(chunks), dim), dtype=np.float32)
+            return emb_matrix
+
+        # Duplicate content (license boilerplate, repeated headers) is
+        # embedded once: later occurrences of a hash wait for the first
+        # one's vector instead of joining the provider batches.
+        pending = []
+        first_row: Dict[str, int] = {}
+        dup_rows: Dict[str, List[int]] = {}
+        for i, content_hash in enumerate(hashes):
+            vector = cached.get(content_hash)
+            if vector is not None:
+                ensure_matrix(len(vector))[i] = vector
+            elif content_hash in first_row:
+                dup_rows.setdefault(content_hash, []).append(i)
+            else:
+                first_row[content_hash] = i
+                pending.append(i)
+
+        # Batch similar-length chunks together: transformer backends pad
+        # every item in a batch to its longest member, so mixed-length
+        # batches waste compute. Results are scattered back by original
+        # index, so output order is unaffected.
+        pending.sort(key=lambda i: len(chunks[i].content))
+
+        if pending:
+            # Pack batches greedily against a rough token budget (about
+            # 4 chars per token) rather than a fixed item count: a few
+            # long chunks no longer blow the provider's request cap and
+            # many tiny chunks no longer underfill it. The length sort
+            # above makes the greedy packing near-optimal.
+            batches: List[List[int]] = []
+            current: List[int] = []
+            current_tokens = 0
+            for i in pending:
+                tokens = len(chunks[i].content) // 4
+                if current and (
+                    current_tokens + tokens > self.max_batch_tokens
+                    or len(current) >= self.max_batch_items
+                ):
+                    batches.append(current)
+                    current = []
+                    current_tokens = 0
+                current.append(i)
+                current_tokens += tokens
+
+            batches.append(current)
+
+            # Embedding calls are I/O-bound against the provider, so
+            # batches are dispatched concurrently instead of awaited one
+            # at a time; the semaphore bounds how many are in flight
+            semaphore = asyncio.Semaphore(self.max_inflight_batches)
+
+            async def embed_batch(batch_number: int, index_batch: List[int]) -> List[Any]:
+                async with semaphore:
+                    # Small jitter so concurrent batches don't hit the
+                    # provider's rate limiter in lockstep
+                    await asyncio.sleep(random.uniform(0, 0.05))
+                    texts = [chunks[i].content for i in index_batch]
+                    try:
+                        async with self._embed_semaphore:
+                            return await self.embedding_provider.get_embeddings_batch(texts)
+                    except Exception as e:
+                        logger.error(f"Failed to generate embeddings for batch {batch_number}: {e}")
+                        raise
+
+            batch_embeddings = await asyncio.gather(
+                *(embed_batch(i + 1, batch) for i, batch in enumerate(batches))
+            )
+
+            # gather preserves submission order; a fancy-index scatter
+            # writes each batch into its original rows in one C-level copy
+            fresh: Dict[str, Any] = {}
+            for index_batch, vectors in zip(batches, batch_embeddings):
+                block = np.asarray(vectors, dtype=np.float32)
+                ensure_matrix(block.shape[1])[index_batch] = block
+                for i, vector in zip(index_batch, vectors):
+                    fresh[hashes[i]] = vector
+
+            # Identical text gets an identical vector - a row copy per
+            # duplicate, not another provider call
+            for content_hash, rows in dup_rows.items():
+                emb_matrix[rows] = emb_matrix[first_row[content_hash]]
+
+            if self.embedding_cache is not None and fresh:
+                try:
+                    await self.embedding_cache.batch_put(
+                        fresh, self._cache_provider, self._cache_model
+                    )
+                except Exception as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+
+        return [
+            KnowledgeChunk(
+                id=chunk.id,
+                content=chunk.content,
+                embedding_vector=emb_matrix[i],
+                source_document_id=chunk.source_document_id,
+                chunk_index=chunk.chunk_index,
+                metadata=chunk.metadata
+            )
+            for i, chunk in enumerate(chunks)
+        ]
     
     async def _index_knowledge_chunks(self, knowledge_chunks: List[KnowledgeChunk]) -> None:
         """Index knowledge chunks in vector database"""
         if not knowledge_chunks:
             return
-        
-        # Prepare documents for indexing
-        documents = []
-        for chunk in knowledge_chunks:
-            doc = {
-                'id': chunk.id,
-                'content': chunk.content,
-                'vector': chunk.embedding_vector,
-                'metadata': {
-                    'source_document_id': chunk.source_document_id,
-                    'chunk_index': chunk.chunk_index,
-                    **chunk.metadata
+
+        def to_documents(chunks: List[KnowledgeChunk]) -> List[Dict[str, Any]]:
+            return [
+                {
+                    'id': chunk.id,
+                    'content': chunk.content,
+                    'vector': chunk.embedding_vector,
+                    'metadata': {
+                        'source_document_id': chunk.source_document_id,
+                        'chunk_index': chunk.chunk_index
+                    } | chunk.metadata
                 }
-            }
-            documents.append(doc)
-        
-        # Index documents
-        success = await self.vector_database.index_documents(
-            index_name="knowledge_base",  # TODO: make configurable
-            documents=documents
-        )
-        
-        if not success:
+                for chunk in chunks
+            ]
+
+        # Shard large inputs into size-bounded uploads submitted
+        # concurrently; one giant call serializes on a single round-trip
+        batch = self._INDEX_BATCH_SIZE
+        results = await asyncio.gather(*(
+            self.vector_database.index_documents(
+                index_name="knowledge_base",  # TODO: make configurable
+                documents=to_documents(knowledge_chunks[i:i + batch])
+            )
+            for i in range(0, len(knowledge_chunks), batch)
+        ))
+
+        if not all(results):
             raise Exception("Failed to index documents in vector database")
     
     async def cleanup_task(self, task_id: str) -> None:
@@ -308,5 +597,13 @@ class LocalWorkflowOrchestrator(WorkflowOrchestrator):
         # Cancel all running tasks
         for task_id in list(self._running_tasks.keys()):
             await self.cleanup_task(task_id)
+
+        if self._status_writer_task is not None and not self._status_writer_task.done():
+            await self._flush_status_updates()
+            self._status_writer_task.cancel()
+            try:
+                await self._status_writer_task
+            except asyncio.CancelledError:
+                pass
         
         logger.info("Workflow orchestrator shutdown completed")
\ No newline at end of file
@@ -2,21 +2,22 @@
 Service factory for creating appropriate adapters based on configuration.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any
 
 from src.abstractions import (
-    EmbeddingProvider, VectorDatabase, StorageProvider,
+    EmbeddingProvider, EmbeddingCache, VectorDatabase, StorageProvider,
     TaskQueue, StateManager, WorkflowOrchestrator, TaggingProvider
 )
 from src.adapters.local import (
     LocalEmbeddingProvider, LocalVectorDatabase, LocalStorageProvider,
-    LocalTaskQueue, LocalStateManager
+    LocalTaskQueue, LocalStateManager, SQLiteEmbeddingCache
 )
 from src.adapters.postgresql import PostgreSQLStateManager
 from src.adapters.aws import (
     BedrockEmbeddingProvider, OpenSearchVectorDatabase, S3StorageProvider,
-    SQSTaskQueue, DynamoDBStateManager
+    SQSTaskQueue, DynamoDBStateManager, DynamoDBEmbeddingCache
 )
 from src.core.workflow import LocalWorkflowOrchestrator
 from src.services import LocalTaggingService
@@ -30,8 +31,23 @@ class ServiceFactory:
     def __init__(self, config):
         """Initialize factory with AppConfig object."""
         self.config = config
+        # Each service is built once and shared - create_* used to
+        # re-instantiate on every call, so the orchestrator, tagging
+        # service and initialize_all_services each got their own copy
+        # of heavy objects like the sentence-transformers model
+        self._cache: Dict[str, Any] = {}
+        self._initialized = False
+
+    def _get_or_create(self, key: str, builder) -> Any:
+        service = self._cache.get(key)
+        if service is None:
+            service = self._cache[key] = builder()
+        return service
         
     def create_embedding_provider(self) -> EmbeddingProvider:
+        return self._get_or_create('embedding_provider', self._build_embedding_provider)
+
+    def _build_embedding_provider(self) -> EmbeddingProvider:
         """Create embedding provider based on configuration."""
         embedding_config = self.config.embedding
         provider_type = embedding_config.provider
@@ -48,7 +64,30 @@ class ServiceFactory:
         else:
             raise ValueError(f"Unknown embedding provider type: {provider_type}")
     
+    def create_embedding_cache(self) -> EmbeddingCache:
+        return self._get_or_create('embedding_cache', self._build_embedding_cache)
+
+    def _build_embedding_cache(self) -> EmbeddingCache:
+        """Create embedding cache matching the embedding provider."""
+        embedding_config = self.config.embedding
+
+        if embedding_config.provider == 'aws':
+            table_name = getattr(embedding_config, 'cache_table_name', None)
+            if table_name:
+                region_name = getattr(embedding_config, 'region_name', 'us-east-1')
+                return DynamoDBEmbeddingCache(
+                    table_name=table_name,
+                    region_name=region_name
+                )
+
+        # SQLite also serves as the fallback when no cache table is configured
+        db_path = getattr(embedding_config, 'cache_db_path', None) or './embedding_cache.db'
+        return SQLiteEmbeddingCache(db_path=db_path)
+
     def create_vector_database(self) -> VectorDatabase:
+        return self._get_or_create('vector_database', self._build_vector_database)
+
+    def _build_vector_database(self) -> VectorDatabase:
         """Create vector database based on configuration."""
         db_config = self.config.vector_database
         db_type = db_config.provider
@@ -73,6 +112,9 @@ class ServiceFactory:
             raise ValueError(f"Unknown vector database type: {db_type}")
     
     def create_storage_provider(self) -> StorageProvider:
+        return self._get_or_create('storage_provider', self._build_storage_provider)
+
+    def _build_storage_provider(self) -> StorageProvider:
         """Create storage provider based on configuration."""
         storage_config = self.config.storage
         storage_type = storage_config.provider
@@ -97,6 +139,9 @@ class ServiceFactory:
             raise ValueError(f"Unknown storage provider type: {storage_type}")
     
     def create_task_queue(self) -> TaskQueue:
+        return self._get_or_create('task_queue', self._build_task_queue)
+
+    def _build_task_queue(self) -> TaskQueue:
         """Create task queue based on configuration."""
         queue_config = self.config.task_queue
         queue_type = queue_config.provider
@@ -116,6 +161,9 @@ class ServiceFactory:
             raise ValueError(f"Unknown task queue type: {queue_type}")
     
     def create_state_manager(self) -> StateManager:
+        return self._get_or_create('state_manager', self._build_state_manager)
+
+    def _build_state_manager(self) -> StateManager:
         """Create state manager based on configuration."""
         state_config = self.config.state_manager
         state_type = state_config.provider
@@ -128,7 +176,11 @@ class ServiceFactory:
             database_url = getattr(state_config, 'database_url', None)
             if not database_url:
                 raise ValueError("Database URL is required for PostgreSQL state manager")
-            return PostgreSQLStateManager(database_url=database_url)
+            return PostgreSQLStateManager(
+                database_url=database_url,
+                pool_min_size=getattr(state_config, 'pool_min_size', 10),
+                pool_max_size=getattr(state_config, 'pool_max_size', 50)
+            )
             
         elif state_type == 'aws':
             table_name = getattr(state_config, 'table_name', None)
@@ -140,7 +192,23 @@ class ServiceFactory:
         else:
             raise ValueError(f"Unknown state manager type: {state_type}")
     
+    @staticmethod
+    def _embed_concurrency(embedding_provider: EmbeddingProvider) -> int:
+        """Concurrency limit for embedding calls by provider type.
+
+        A local sentence-transformers model is CPU-bound: concurrent
+        encode() calls multiply PyTorch's thread pools onto the same
+        cores and throughput collapses, so it gets a single slot.
+        Remote providers tolerate parallel requests.
+        """
+        if isinstance(embedding_provider, LocalEmbeddingProvider):
+            return 1
+        return 4
+
     def create_workflow_orchestrator(self) -> WorkflowOrchestrator:
+        return self._get_or_create('workflow_orchestrator', self._build_workflow_orchestrator)
+
+    def _build_workflow_orchestrator(self) -> WorkflowOrchestrator:
         """Create workflow orchestrator based on configuration."""
         workflow_config = self.config.workflow
         workflow_type = workflow_config.provider
@@ -156,7 +224,9 @@ class ServiceFactory:
                 embedding_provider=embedding_provider,
                 vector_database=vector_database,
                 storage_provider=storage_provider,
-                state_manager=state_manager
+                state_manager=state_manager,
+                embedding_cache=self.create_embedding_cache(),
+                embed_concurrency=self._embed_concurrency(embedding_provider)
             )
             
         elif workflow_type == 'aws':
@@ -171,13 +241,18 @@ class ServiceFactory:
                 embedding_provider=embedding_provider,
                 vector_database=vector_database,
                 storage_provider=storage_provider,
-                state_manager=state_manager
+                state_manager=state_manager,
+                embedding_cache=self.create_embedding_cache(),
+                embed_concurrency=self._embed_concurrency(embedding_provider)
             )
             
         else:
             raise ValueError(f"Unknown workflow orchestrator type: {workflow_type}")
     
     def create_tagging_provider(self) -> TaggingProvider:
+        return self._get_or_create('tagging_provider', self._build_tagging_provider)
+
+    def _build_tagging_provider(self) -> TaggingProvider:
         """Create tagging provider based on configuration."""
         # For now, we only support local tagging service
         # In the future, this could be extended to support AI-based tagging services
@@ -188,7 +263,8 @@ class ServiceFactory:
         """Initialize all services and return them in a dictionary."""
         logger.info("Initializing all services...")
         
-        # Create all services
+        # Create all services (cached - these are the same instances
+        # the orchestrator and tagging service are wired with)
         embedding_provider = self.create_embedding_provider()
         vector_database = self.create_vector_database()
         storage_provider = self.create_storage_provider()
@@ -197,11 +273,17 @@ class ServiceFactory:
         workflow_orchestrator = self.create_workflow_orchestrator()
         tagging_provider = self.create_tagging_provider()
         
-        # Initialize services that require initialization
-        await embedding_provider.initialize()
-        await vector_database.initialize()
-        await task_queue.initialize()
-        await state_manager.initialize()
+        # Initialize services concurrently - they are independent, so
+        # startup costs max(t_i) instead of the sum. The gate keeps a
+        # second call from re-running initialize on shared instances.
+        if not self._initialized:
+            await asyncio.gather(
+                embedding_provider.initialize(),
+                vector_database.initialize(),
+                task_queue.initialize(),
+                state_manager.initialize()
+            )
+            self._initialized = True
         
         services = {
             'embedding_provider': embedding_provider,
@@ -311,12 +311,23 @@ class ProcessingService:
     ) -> None:
         """Update task status"""
         try:
-            success = await self.state_manager.update_task_status(
-                task_id=task_id,
-                status=status,
-                error_message=message if status == TaskStatus.FAILED else None,
-                result_data=result_data
-            )
+            # Prefer the single round-trip update-and-read path when the
+            # state manager provides it (PostgreSQL)
+            if hasattr(self.state_manager, 'update_and_get_task_status'):
+                task = await self.state_manager.update_and_get_task_status(
+                    task_id=task_id,
+                    status=status,
+                    error_message=message if status == TaskStatus.FAILED else None,
+                    result_data=result_data
+                )
+                success = task is not None
+            else:
+                success = await self.state_manager.update_task_status(
+                    task_id=task_id,
+                    status=status,
+                    error_message=message if status == TaskStatus.FAILED else None,
+                    result_data=result_data
+                )
             
             if not success:
                 logger.warning(f"Failed to update task status for {task_id}")